@@ -172,21 +172,14 @@ def build_twin_glb(twin_json, default_size_mm=20.0):
     scene = trimesh.Scene()
     box_size = twin_json.get('dice_size_mm', default_size_mm) * MM_TO_M  # e.g. 20mm → 0.02m
 
+    base_frame = scene.graph.base_frame
+    geom_names = {}  # color -> geometry name already registered in the scene
+
     for obj in twin_json.get('objects', []):
         obj_id = obj.get('id', 'unknown')
         props = obj.get('properties', {})
         trans = obj.get('transform', {})
-
-        # Create box mesh (meter units)
-        mesh = trimesh.creation.box(extents=[box_size, box_size, box_size])
-
-        # Floor correction: shift cube up so bottom face sits at Y=0
-        mesh.apply_translation([0, box_size / 2, 0])
-
-        # Apply color
-        color_name = props.get('color', 'gray')
-        rgba = get_color_rgba(color_name)
-        mesh.visual.face_colors = rgba
+        color_name = props.get('color', 'gray').lower()
 
         # Build transform matrix
         pos = trans.get('position', {'x': 0, 'y': 0, 'z': 0})
@@ -217,8 +210,25 @@ def build_twin_glb(twin_json, default_size_mm=20.0):
             matrix_trans, matrix_rot, matrix_scale
         )
 
+        geom_name = geom_names.get(color_name)
+        if geom_name is not None:
+            # Same color already registered: only add a node-level transform
+            scene.graph.update(frame_from=base_frame, frame_to=obj_id,
+                               matrix=final_transform, geometry=geom_name)
+            continue
+
+        # Create box mesh (meter units), shared by every cube of this color
+        mesh = trimesh.creation.box(extents=[box_size, box_size, box_size])
+
+        # Floor correction: shift cube up so bottom face sits at Y=0
+        mesh.apply_translation([0, box_size / 2, 0])
+
+        # Apply color
+        mesh.visual.face_colors = get_color_rgba(color_name)
+
         # Add to scene with node-level transform
         scene.add_geometry(mesh, node_name=obj_id, transform=final_transform)
+        geom_names[color_name] = scene.graph[obj_id][1]
 
     # Export to GLB bytes in memory
     buffer = io.BytesIO()
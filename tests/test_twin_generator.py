@@ -164,6 +164,38 @@ class TestBuildTwinGlb(unittest.TestCase):
         loaded = trimesh.load(io.BytesIO(glb), file_type='glb')
         self.assertIsNotNone(loaded)
 
+    def test_glb_same_color_shares_geometry(self):
+        """Cubes of one color share a single mesh, each with its own node transform."""
+        positions = {
+            'dice_a': (100.0, 0.0, 50.0),
+            'dice_b': (-40.0, 0.0, 120.0),
+            'dice_c': (0.0, 0.0, -80.0),
+        }
+        twin_json = {
+            'dice_size_mm': 20.0,
+            'objects': [
+                {
+                    'id': obj_id,
+                    'properties': {'color': 'red'},
+                    'transform': {'position': {'x': x, 'y': y, 'z': z}},
+                }
+                for obj_id, (x, y, z) in positions.items()
+            ],
+        }
+        glb = self.build_twin_glb(twin_json)
+
+        import io
+        import numpy as np
+        loaded = trimesh.load(io.BytesIO(glb), file_type='glb')
+
+        self.assertEqual(len(loaded.geometry), 1)
+        shared = next(iter(loaded.geometry))
+        for obj_id, pos in positions.items():
+            matrix, geom_name = loaded.graph[obj_id]
+            self.assertEqual(geom_name, shared)
+            np.testing.assert_allclose(matrix[:3, 3], np.array(pos) * 0.001, atol=1e-6)
+            np.testing.assert_allclose(matrix[:3, :3], np.eye(3), atol=1e-6)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -1081,6 +1081,7 @@ class CalibratorGUI:
             "pulses": pulses,
             "angles": angles
         }
+        self.manager.mark_geometry_dirty(vertex_id=vertex_id)
         
         # Update indicator
         if vertex_id in self.vertex_indicators:
@@ -1147,6 +1148,7 @@ class CalibratorGUI:
             "pulses": pulses,
             "angles": angles
         }
+        self.manager.mark_geometry_dirty(arm=arm)
         
         # Update indicator
         if arm in self.share_point_indicators:
@@ -0,0 +1,80 @@
+"""
+Config Cache
+Process-wide cache for servo_config.json, its computed geometry and a
+shared ServoManager, so scripts run in the same process parse the config
+and derive the geometry only once.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+try:
+    import orjson  # Optional: faster JSON parsing
+except ImportError:
+    orjson = None
+
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _resolve(path):
+    """Resolve relative paths against this directory (same as ServoManager)."""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(_BASE_DIR, path)
+
+
+@lru_cache(maxsize=4)
+def _load(path, mtime):
+    """Parse a config file; keyed by mtime so edits on disk are picked up."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def get_config(path="servo_config.json"):
+    """
+    Get parsed servo configuration.
+
+    The returned dict is shared between callers - treat it as read-only.
+
+    Args:
+        path: Config file path (relative paths resolve to this directory)
+
+    Returns:
+        dict: Parsed configuration
+    """
+    path = _resolve(path)
+    return _load(path, os.path.getmtime(path))
+
+
+@lru_cache(maxsize=4)
+def _geometry(path, mtime):
+    """Compute geometry for one parsed config version."""
+    from geometry_engine import compute_geometry
+    return compute_geometry(_load(path, mtime))
+
+
+def get_geometry(path="servo_config.json"):
+    """
+    Get parsed servo configuration together with its computed geometry.
+
+    Both dicts are shared between callers - treat them as read-only.
+
+    Args:
+        path: Config file path (relative paths resolve to this directory)
+
+    Returns:
+        tuple: (config, geometry)
+    """
+    path = _resolve(path)
+    mtime = os.path.getmtime(path)
+    return _load(path, mtime), _geometry(path, mtime)
+
+
+@lru_cache(maxsize=1)
+def get_manager():
+    """Get a process-wide ServoManager for the default config."""
+    from servo_manager import ServoManager
+    return ServoManager()
@@ -18,6 +18,30 @@ KINEMATICS_CONSTANTS = {
     "stance_threshold": 60.0  # Yaw delta threshold for stance determination (degrees)
 }
 
+_SLOT_KEYS = tuple(f"slot_{slot}" for slot in range(7))
+_EMPTY = {}  # Shared fallback for missing arm/slot dicts (read-only)
+_MISSING = object()  # Distinguishes absent keys from explicit None in cache keys
+_GEOMETRY_CACHE_SIZE = 1024
+
+
+# ========== Config Helpers ==========
+
+def link_lengths(config, arm, defaults=(0, 0, 0, 0, 0, 0)):
+    """
+    Get the link lengths of an arm in a single pass over its config.
+    
+    Args:
+        config: Full servo configuration dict
+        arm: 'left_arm' or 'right_arm'
+        defaults: Fallback length per slot 1-6
+    
+    Returns:
+        tuple: Lengths of slots 1-6 (index = slot - 1)
+    """
+    arm_cfg = config.get(arm) or _EMPTY
+    return tuple(arm_cfg.get(_SLOT_KEYS[slot], _EMPTY).get("length", default)
+                 for slot, default in enumerate(defaults, 1))
+
 
 # ========== Trilateration Functions ==========
 
@@ -36,7 +60,7 @@ def circle_intersection(c1, r1, c2, r2):
     """
     x1, y1 = c1
     x2, y2 = c2
-    d = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+    d = math.hypot(x2 - x1, y2 - y1)
     
     # Check if circles intersect
     if d > r1 + r2 or d < abs(r1 - r2) or d == 0:
@@ -75,11 +99,7 @@ def compute_share_to_vertex(config, arm, vertex, base_pos):
         float: Distance from share point to vertex
     """
     # Get reach (horizontal projection for coordinate calculation)
-    a2 = config.get(arm, {}).get("slot_2", {}).get("length", 0)
-    a3 = config.get(arm, {}).get("slot_3", {}).get("length", 0)
-    a4 = config.get(arm, {}).get("slot_4", {}).get("length", 0)
-    a5 = config.get(arm, {}).get("slot_5", {}).get("length", 0)
-    a6 = config.get(arm, {}).get("slot_6", {}).get("length", 0)
+    _, a2, a3, a4, a5, a6 = link_lengths(config, arm)
     
     angles = vertex.get("angles", {})
     
@@ -125,7 +145,7 @@ def compute_share_to_vertex(config, arm, vertex, base_pos):
     vy = base_pos[1] + reach_horiz * math.cos(yaw)
     
     # Return distance from origin (share point) to vertex
-    return math.sqrt(vx ** 2 + vy ** 2)
+    return math.hypot(vx, vy)
 
 
 def select_vertex_by_yaw(p1, p2, base, yaw):
@@ -141,12 +161,12 @@ def select_vertex_by_yaw(p1, p2, base, yaw):
     Returns:
         The point that best matches the yaw direction
     """
-    reach = math.sqrt((p1[0] - base[0]) ** 2 + (p1[1] - base[1]) ** 2)
+    reach = math.hypot(p1[0] - base[0], p1[1] - base[1])
     expected_x = base[0] + reach * (-math.sin(yaw))
     expected_y = base[1] + reach * math.cos(yaw)
     
-    dist1 = math.sqrt((p1[0] - expected_x) ** 2 + (p1[1] - expected_y) ** 2)
-    dist2 = math.sqrt((p2[0] - expected_x) ** 2 + (p2[1] - expected_y) ** 2)
+    dist1 = math.hypot(p1[0] - expected_x, p1[1] - expected_y)
+    dist2 = math.hypot(p2[0] - expected_x, p2[1] - expected_y)
     
     return p1 if dist1 < dist2 else p2
 
@@ -387,7 +407,7 @@ def compute_reach(config, arm, point_data, is_vertex=True):
 
         # Return tuple: (horizontal_reach, 3d_reach)
         # horizontal for coordinate calc, 3d for distance display
-        return (abs(fk_x), math.sqrt(fk_x**2 + fk_y**2))
+        return (abs(fk_x), math.hypot(fk_x, fk_y))
     else:
         # Share Point: Full FK with Slots 2-6 (Euclidean distance)
         slot2_cfg = config.get(arm, {}).get("slot_2", {})
@@ -421,7 +441,7 @@ def compute_reach(config, arm, point_data, is_vertex=True):
              (a4 + a5 + a6) * math.sin(angle_wrist))
 
         # Euclidean distance
-        return math.sqrt(x**2 + y**2)
+        return math.hypot(x, y)
 
 
 def compute_yaw(config, arm, point_data):
@@ -472,17 +492,30 @@ def compute_base_direct(point_x, point_y, reach, yaw):
 
 # ========== Main Entry Point ==========
 
-def compute_geometry(config):
+def compute_geometry(config, prev_geometry=None, dirty_arms=None, dirty_vertices=None):
     """
     Compute geometry section: bases, vertices, share points positions.
     Uses Share Point as origin (0, 0).
     
+    When prev_geometry and both change sets are given, only bases of
+    dirty arms and vertices that are dirty (or owned by a dirty arm)
+    are recomputed; the rest are reused from prev_geometry.
+    
     Args:
         config: Full servo configuration dict
+        prev_geometry: Previously computed geometry dict (optional)
+        dirty_arms: Set of arm names whose base changed (optional)
+        dirty_vertices: Set of vertex ID strings that changed (optional)
         
     Returns:
         dict: Geometry data with bases, vertices, distances
     """
+    incremental = (prev_geometry is not None and
+                   dirty_arms is not None and
+                   dirty_vertices is not None)
+    prev_bases = prev_geometry.get("bases", {}) if incremental else {}
+    prev_vertices = prev_geometry.get("vertices", {}) if incremental else {}
+
     geometry = {
         "coordinate_system": "+X=right, +Y=up",
         "origin": "share_point",
@@ -503,6 +536,10 @@ def compute_geometry(config):
         if not share_point:
             continue
 
+        if incremental and arm not in dirty_arms and arm in prev_bases:
+            geometry["bases"][arm] = prev_bases[arm]
+            continue
+
         reach = compute_reach(config, arm, share_point, is_vertex=False)
         yaw = compute_yaw(config, arm, share_point)
 
@@ -528,6 +565,12 @@ def compute_geometry(config):
         if not owner or owner not in geometry["bases"]:
             continue
 
+        prev = prev_vertices.get(str(vid))
+        if (incremental and prev and prev.get("owner") == owner and
+                str(vid) not in dirty_vertices and owner not in dirty_arms):
+            geometry["vertices"][str(vid)] = prev
+            continue
+
         base = geometry["bases"][owner]
         base_pos = (base["x"], base["y"])
         
@@ -571,27 +614,27 @@ def compute_geometry(config):
         for v2 in vertex_ids[i+1:]:
             p1 = geometry["vertices"][v1]
             p2 = geometry["vertices"][v2]
-            dist = math.sqrt((p1["x"] - p2["x"])**2 + (p1["y"] - p2["y"])**2)
+            dist = math.hypot(p1["x"] - p2["x"], p1["y"] - p2["y"])
             distances["vertex_to_vertex"][f"{v1}_{v2}"] = round(dist, 1)
 
     # Base to Vertex distances
     for arm, base in geometry["bases"].items():
         arm_distances = {}
         for vid, vertex in geometry["vertices"].items():
-            dist = math.sqrt((base["x"] - vertex["x"])**2 + (base["y"] - vertex["y"])**2)
+            dist = math.hypot(base["x"] - vertex["x"], base["y"] - vertex["y"])
             arm_distances[vid] = round(dist, 1)
         distances["base_to_vertex"][arm] = arm_distances
 
     # Share Point to Vertex distances (from origin 0,0)
     for vid, vertex in geometry["vertices"].items():
-        dist = math.sqrt(vertex["x"]**2 + vertex["y"]**2)
+        dist = math.hypot(vertex["x"], vertex["y"])
         distances["share_point_to_vertex"][vid] = round(dist, 1)
 
     # Base to Base distance
     if "left_arm" in geometry["bases"] and "right_arm" in geometry["bases"]:
         left = geometry["bases"]["left_arm"]
         right = geometry["bases"]["right_arm"]
-        dist = math.sqrt((left["x"] - right["x"])**2 + (left["y"] - right["y"])**2)
+        dist = math.hypot(left["x"] - right["x"], left["y"] - right["y"])
         distances["base_to_base"] = round(dist, 1)
 
     geometry["distances"] = distances
@@ -599,6 +642,63 @@ def compute_geometry(config):
     return geometry
 
 
+# ========== Cached Entry Point ==========
+
+_geometry_cache = {}
+
+
+def _point_key(point):
+    """Owner and angles of a vertex/share point, or None when unset."""
+    if not point:
+        return None
+    angles = point.get("angles") or _EMPTY
+    return (point.get("owner"), tuple(sorted(angles.items())))
+
+
+def geometry_key(config):
+    """
+    Build a hashable key from the config fields compute_geometry reads.
+
+    Only slot length/zero_offset/min_pos and each point's owner/angles
+    feed the geometry, so unrelated sections (pulses, connection, the
+    stored geometry itself) do not affect the key.
+
+    Returns:
+        tuple: (arms, vertices) - per arm (left, right) its slot fields
+        and share point; per vertex 1-8 its owner/angles. Comparing the
+        parts of two keys tells which arms/vertices changed.
+    """
+    share_points = config.get("share_points") or _EMPTY
+    vertices = config.get("vertices") or _EMPTY
+    arms = []
+    for arm in ("left_arm", "right_arm"):
+        arm_cfg = config.get(arm) or _EMPTY
+        slots = []
+        for slot_key in _SLOT_KEYS[1:]:
+            slot_cfg = arm_cfg.get(slot_key) or _EMPTY
+            slots.append((slot_cfg.get("length", _MISSING),
+                          slot_cfg.get("zero_offset", _MISSING),
+                          slot_cfg.get("min_pos", _MISSING)))
+        arms.append((tuple(slots), _point_key(share_points.get(arm))))
+    return (tuple(arms),
+            tuple(_point_key(vertices.get(str(vid))) for vid in range(1, 9)))
+
+
+def compute_geometry_cached(config):
+    """
+    Memoized compute_geometry for sweeps that revisit the same config.
+
+    The returned dict is shared between callers - treat it as read-only.
+    """
+    key = geometry_key(config)
+    geometry = _geometry_cache.get(key)
+    if geometry is None:
+        if len(_geometry_cache) >= _GEOMETRY_CACHE_SIZE:
+            _geometry_cache.pop(next(iter(_geometry_cache)))  # Drop oldest
+        geometry = _geometry_cache[key] = compute_geometry(config)
+    return geometry
+
+
 # ========== Standalone Test ==========
 
 if __name__ == "__main__":
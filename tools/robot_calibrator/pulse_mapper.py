@@ -145,17 +145,28 @@ class PulseMapper:
         Returns:
             float: Physical angle (approximate)
         """
-        actuation_range = motor_config.get("actuation_range", 180)
-        pulse_min = motor_config.get("pulse_min", 500)
-        pulse_max = motor_config.get("pulse_max", 2500)
+        return self.pulses_to_angles((pulse_us,), motor_config)[0]
+
+    def pulses_to_angles(self, pulses, motor_config):
+        """
+        Convert several pulse widths (us) of one motor to physical angles.
+        Motor specs are looked up once and shared by every conversion;
+        pulse_to_angle delegates here so the formula lives in one place.
         
-        # Calculate ratio from pulse
-        ratio = (pulse_us - pulse_min) / (pulse_max - pulse_min)
+        Args:
+            pulses: Iterable of pulse widths in microseconds
+            motor_config: Dict with 'actuation_range', 'pulse_min', 'pulse_max'
         
-        # Convert to angle
-        angle = ratio * actuation_range
+        Returns:
+            list: Physical angles (approximate), in the same order as pulses
+        """
+        actuation_range = motor_config.get("actuation_range", 180)
+        pulse_min = motor_config.get("pulse_min", 500)
+        pulse_range = motor_config.get("pulse_max", 2500) - pulse_min
         
-        return max(0, min(actuation_range, angle))
+        # ratio = (pulse - pulse_min) / pulse_range, angle = ratio * range, clamped
+        return [max(0, min(actuation_range, (pulse_us - pulse_min) / pulse_range * actuation_range))
+                for pulse_us in pulses]
 
 
 # Self-test
@@ -3,10 +3,25 @@ Servo Manager
 Manages servo configuration, pin mapping, and limit settings.
 """
 
+import inspect
 import json
 import os
+import weakref
 from pulse_mapper import PulseMapper
-from geometry_engine import compute_geometry as _compute_geometry
+from geometry_engine import compute_geometry as _compute_geometry, geometry_key
+
+
+# Template for slots created on demand (copied, never mutated)
+_DEFAULT_SLOT = {"channel": 0, "min": 0, "max": 180, "type": "vertical", "min_pos": "bottom", "length": 0, "initial": 90, "zero_offset": 0}
+
+# Arms holding per-slot servo config
+ARM_NAMES = ("left_arm", "right_arm")
+
+# Slot keys indexed by slot number (index 0 unused)
+_SLOT_KEYS = tuple(f"slot_{slot}" for slot in range(7))
+
+# Shared fallback for missing arms/slots (read-only, never mutated)
+_EMPTY = {}
 
 
 class ServoManager:
@@ -44,6 +59,14 @@ class ServoManager:
         }
     }
 
+    # (pulse field, derived angle field, default angle for backfill)
+    PULSE_ANGLE_FIELDS = (
+        ("initial_pulse", "initial", 90),
+        ("zero_pulse", "zero_offset", 0),
+        ("min_pulse", "min", 0),
+        ("max_pulse_limit", "max", 180),
+    )
+
     def __init__(self, config_path="servo_config.json"):
         if not os.path.isabs(config_path):
             base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -53,16 +76,34 @@ class ServoManager:
         self.config = None
         self.mapper = PulseMapper()
         self._observers = []
+        self._geometry_dirty = True     # Full rebuild required
+        self._dirty_arms = set()        # Arms whose base/vertices need recompute
+        self._dirty_vertices = set()    # Vertex IDs that need recompute
+        self._pulses_dirty = True       # Pulse/angle fields need migration + sync
+        self._last_geometry_key = None  # Geometry inputs of the last computation
         self.load_config()
 
     def add_observer(self, callback):
-        """Register a callback to be notified on config changes."""
-        if callback not in self._observers:
-            self._observers.append(callback)
+        """
+        Register a callback to be notified on config changes.
+        Bound methods are held weakly, so observers owned by destroyed
+        widgets drop out instead of accumulating.
+        """
+        if any(ref() == callback for ref in self._observers):
+            return
+        if inspect.ismethod(callback):
+            self._observers.append(weakref.WeakMethod(callback))
+        else:
+            self._observers.append(lambda: callback)
 
     def _notify_observers(self):
-        """Notify all observers that config has changed."""
-        for callback in self._observers:
+        """Notify all live observers that config has changed; prune dead ones."""
+        # Iterate a copy so callbacks may register observers; prune in place
+        for ref in list(self._observers):
+            callback = ref()
+            if callback is None:
+                self._observers.remove(ref)
+                continue
             try:
                 callback()
             except Exception as e:
@@ -82,23 +123,29 @@ class ServoManager:
             self.config = self._deep_copy(self.DEFAULT_CONFIG)
             print("Using default config")
         
+        self._geometry_dirty = True
+        self._pulses_dirty = True
+        self._last_geometry_key = None
         self._notify_observers()
 
     def save_config(self):
         """Save configuration to JSON file."""
-        # 1. Migration: Ensure Pulse values exist (Angle -> Pulse)
-        try:
-            self._ensure_pulses_native() 
-        except Exception as e:
-            print(f"Warning: Failed to ensure pulse values: {e}")
+        # Steps 1-2 are skipped when no pulse/angle field changed since last save
+        if self._pulses_dirty:
+            # 1. Migration: Ensure Pulse values exist (Angle -> Pulse)
+            try:
+                self._ensure_pulses_native() 
+            except Exception as e:
+                print(f"Warning: Failed to ensure pulse values: {e}")
 
-        # 2. Enforcement: Sync Angles from Pulse (Pulse -> Angle)
-        try:
-            self._sync_angles_from_pulses() 
-        except Exception as e:
-            print(f"Warning: Failed to sync angles from pulses: {e}")
+            # 2. Enforcement: Sync Angles from Pulse (Pulse -> Angle)
+            try:
+                self._sync_angles_from_pulses() 
+            except Exception as e:
+                print(f"Warning: Failed to sync angles from pulses: {e}")
 
         # 3. Compute Geometry (bases, vertices positions)
+        #    Reuses the previous result when geometry inputs are unchanged
         try:
             self.compute_geometry()
         except Exception as e:
@@ -109,6 +156,7 @@ class ServoManager:
             with open(self.config_path, 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, indent=2)
             print(f"Config saved to {self.config_path}")
+            self._pulses_dirty = False
             return True
         except IOError as e:
             print(f"Failed to save config: {e}")
@@ -125,32 +173,28 @@ class ServoManager:
         """
         if not self.config: return
 
-        for arm_name, arm_data in self.config.items():
-            if arm_name not in ["left_arm", "right_arm"]: continue
+        # Bind hot-loop lookups once
+        field_specs = self.PULSE_ANGLE_FIELDS
+        pulses_to_angles = self.mapper.pulses_to_angles
+
+        for arm_name in ARM_NAMES:
+            arm_data = self.config.get(arm_name)
+            if not arm_data: continue
             
-            for slot_key, slot_config in arm_data.items():
-                # 1. Sync Initial
-                if "initial_pulse" in slot_config:
-                    pulse = slot_config["initial_pulse"]
-                    angle = self.mapper.pulse_to_angle(pulse, slot_config)
-                    slot_config["initial"] = float(f"{angle:.1f}")
-
-                # 2. Sync Zero Offset
-                if "zero_pulse" in slot_config:
-                    pulse = slot_config["zero_pulse"]
-                    angle = self.mapper.pulse_to_angle(pulse, slot_config)
-                    slot_config["zero_offset"] = float(f"{angle:.1f}")
-                
-                # 3. Sync Min/Max Limits
-                if "min_pulse" in slot_config:
-                    pulse = slot_config["min_pulse"]
-                    angle = self.mapper.pulse_to_angle(pulse, slot_config)
-                    slot_config["min"] = float(f"{angle:.1f}")
-
-                if "max_pulse_limit" in slot_config:
-                    pulse = slot_config["max_pulse_limit"]
-                    angle = self.mapper.pulse_to_angle(pulse, slot_config)
-                    slot_config["max"] = float(f"{angle:.1f}")
+            for slot in range(1, 7):
+                slot_config = arm_data.get(_SLOT_KEYS[slot])
+                if slot_config is None: continue
+
+                # Convert all present pulse fields of this slot in one batch
+                fields = [(pulse_key, angle_key)
+                          for pulse_key, angle_key, _ in field_specs
+                          if pulse_key in slot_config]
+                if not fields: continue
+
+                pulses = [slot_config[pulse_key] for pulse_key, _ in fields]
+                angles = pulses_to_angles(pulses, slot_config)
+                for (_, angle_key), angle in zip(fields, angles):
+                    slot_config[angle_key] = round(angle, 1)
 
     def _ensure_pulses_native(self):
         """
@@ -159,29 +203,28 @@ class ServoManager:
         """
         if not self.config: return
 
-        for arm_name, arm_data in self.config.items():
-            if arm_name not in ["left_arm", "right_arm"]: continue
+        # Bind hot-loop lookups once
+        field_specs = self.PULSE_ANGLE_FIELDS
+        calculate_pulses = self._calculate_pulses
+
+        for arm_name in ARM_NAMES:
+            arm_data = self.config.get(arm_name)
+            if not arm_data: continue
             
-            for slot_key, slot_config in arm_data.items():
-                # Backfill Initial Pulse
-                if "initial_pulse" not in slot_config:
-                    angle = slot_config.get("initial", 90)
-                    slot_config["initial_pulse"] = self._calculate_pulse(arm_name, slot_key.split('_')[1], angle)
-                
-                # Backfill Zero Pulse
-                if "zero_pulse" not in slot_config:
-                    angle = slot_config.get("zero_offset", 0)
-                    slot_config["zero_pulse"] = self._calculate_pulse(arm_name, slot_key.split('_')[1], angle)
-
-                # Backfill Min Pulse (Limit)
-                if "min_pulse" not in slot_config:
-                    angle = slot_config.get("min", 0)
-                    slot_config["min_pulse"] = self._calculate_pulse(arm_name, slot_key.split('_')[1], angle)
-
-                # Backfill Max Pulse (Limit)
-                if "max_pulse_limit" not in slot_config:
-                    angle = slot_config.get("max", 180)
-                    slot_config["max_pulse_limit"] = self._calculate_pulse(arm_name, slot_key.split('_')[1], angle)
+            for slot in range(1, 7):
+                slot_config = arm_data.get(_SLOT_KEYS[slot])
+                if slot_config is None: continue
+
+                # Backfill all missing pulse fields of this slot in one batch
+                missing = [(pulse_key, slot_config.get(angle_key, default))
+                           for pulse_key, angle_key, default in field_specs
+                           if pulse_key not in slot_config]
+                if not missing: continue
+
+                angles = [angle for _, angle in missing]
+                pulses = calculate_pulses(slot_config, angles)
+                for (pulse_key, _), pulse in zip(missing, pulses):
+                    slot_config[pulse_key] = pulse
 
     def get_channel(self, arm, slot):
         """
@@ -194,8 +237,7 @@ class ServoManager:
         Returns:
             int: PCA9685 channel (0-15)
         """
-        slot_key = f"slot_{slot}"
-        return self.config.get(arm, {}).get(slot_key, {}).get("channel", 0)
+        return self._slot_config(arm, slot).get("channel", 0)
 
     def set_channel(self, arm, slot, channel):
         """
@@ -207,10 +249,7 @@ class ServoManager:
             channel: PCA9685 channel (0-15)
         """
         slot_key = f"slot_{slot}"
-        if arm not in self.config:
-            self.config[arm] = {}
-        if slot_key not in self.config[arm]:
-            self.config[arm][slot_key] = {"channel": 0, "min": 0, "max": 180, "type": "vertical", "min_pos": "bottom", "length": 0}
+        self._ensure_slot_exists(arm, slot_key)
         self.config[arm][slot_key]["channel"] = channel
 
     def get_limits(self, arm, slot):
@@ -224,8 +263,7 @@ class ServoManager:
         Returns:
             dict: {"min": int, "max": int}
         """
-        slot_key = f"slot_{slot}"
-        slot_config = self.config.get(arm, {}).get(slot_key, {})
+        slot_config = self._slot_config(arm, slot)
         return {
             "min": slot_config.get("min", 0),
             "max": slot_config.get("max", 180)
@@ -242,35 +280,35 @@ class ServoManager:
             value: Angle value (0-180)
         """
         slot_key = f"slot_{slot}"
-        if arm not in self.config:
-            self.config[arm] = {}
-        if slot_key not in self.config[arm]:
-            self.config[arm][slot_key] = {"channel": 0, "min": 0, "max": 180, "type": "vertical", "min_pos": "bottom", "length": 0}
-        self.config[arm][slot_key][limit_type] = value
-        
+        self._ensure_slot_exists(arm, slot_key)
         self.config[arm][slot_key][limit_type] = value
-        
+        self._pulses_dirty = True
+
     def set_limit_pulse(self, arm, slot, limit_type, value):
         """Set min/max pulse limit directly."""
         slot_key = f"slot_{slot}"
         self._ensure_slot_exists(arm, slot_key)
         key = "min_pulse" if limit_type == "min" else "max_pulse_limit"
         self.config[arm][slot_key][key] = int(value)
+        self._pulses_dirty = True
 
     def _calculate_pulse(self, arm, slot, angle):
         """Calculate pulse width (us) for a given physical angle."""
-        slot_key = f"slot_{slot}"
-        config = self.config.get(arm, {}).get(slot_key, {})
-        
-        actuation_range = config.get("actuation_range", 180)
-        pulse_min = config.get("pulse_min", 500)
-        pulse_max = config.get("pulse_max", 2500)
+        config = self._slot_config(arm, slot)
+        return self._calculate_pulses(config, (angle,))[0]
+
+    def _calculate_pulses(self, slot_config, angles):
+        """Calculate pulse widths (us) for several physical angles of one slot."""
+        actuation_range = slot_config.get("actuation_range", 180)
+        pulse_min = slot_config.get("pulse_min", 500)
+        pulse_max = slot_config.get("pulse_max", 2500)
         
         # Basic mapping: pulse = min + (angle / range) * (max - min)
         if actuation_range <= 0: actuation_range = 180 # Safety
         
-        pulse = pulse_min + (float(angle) / actuation_range) * (pulse_max - pulse_min)
-        return int(pulse)
+        pulse_span = pulse_max - pulse_min
+        return [int(pulse_min + (float(angle) / actuation_range) * pulse_span)
+                for angle in angles]
 
     def get_saved_port(self):
         """Get saved COM port from config."""
@@ -295,8 +333,7 @@ class ServoManager:
         Returns:
             str: 'vertical' or 'horizontal'
         """
-        slot_key = f"slot_{slot}"
-        return self.config.get(arm, {}).get(slot_key, {}).get("type", "vertical")
+        return self._slot_config(arm, slot).get("type", "vertical")
 
     def set_type(self, arm, slot, value):
         """
@@ -322,8 +359,7 @@ class ServoManager:
         Returns:
             str: For vertical: 'top'/'bottom', For horizontal: 'left'/'right'
         """
-        slot_key = f"slot_{slot}"
-        return self.config.get(arm, {}).get(slot_key, {}).get("min_pos", "bottom")
+        return self._slot_config(arm, slot).get("min_pos", "bottom")
 
     def set_min_pos(self, arm, slot, value):
         """
@@ -337,6 +373,7 @@ class ServoManager:
         slot_key = f"slot_{slot}"
         self._ensure_slot_exists(arm, slot_key)
         self.config[arm][slot_key]["min_pos"] = value
+        self._dirty_arms.add(arm)
 
     def get_length(self, arm, slot):
         """
@@ -349,8 +386,7 @@ class ServoManager:
         Returns:
             float: Distance in mm
         """
-        slot_key = f"slot_{slot}"
-        return self.config.get(arm, {}).get(slot_key, {}).get("length", 0)
+        return self._slot_config(arm, slot).get("length", 0)
 
     def set_length(self, arm, slot, value):
         """
@@ -364,13 +400,24 @@ class ServoManager:
         slot_key = f"slot_{slot}"
         self._ensure_slot_exists(arm, slot_key)
         self.config[arm][slot_key]["length"] = value
+        self._dirty_arms.add(arm)
+
+    def _slot_config(self, arm, slot):
+        """
+        Return the config dict of a slot for read access.
+        Missing arms/slots resolve to a shared empty dict (do not mutate).
+        """
+        arm_data = self.config.get(arm)
+        if not arm_data:
+            return _EMPTY
+        return arm_data.get(_SLOT_KEYS[int(slot)], _EMPTY)
 
     def _ensure_slot_exists(self, arm, slot_key):
         """Helper to ensure arm and slot exist in config."""
-        if arm not in self.config:
-            self.config[arm] = {}
-        if slot_key not in self.config[arm]:
-            self.config[arm][slot_key] = {"channel": 0, "min": 0, "max": 180, "type": "vertical", "min_pos": "bottom", "length": 0, "initial": 90, "zero_offset": 0}
+        arm_dict = self.config.setdefault(arm, {})
+        if slot_key not in arm_dict:
+            arm_dict[slot_key] = _DEFAULT_SLOT.copy()
+            self._pulses_dirty = True  # New slot needs pulse backfill
 
     def get_initial(self, arm, slot):
         """
@@ -383,8 +430,7 @@ class ServoManager:
         Returns:
             int: Initial angle (0-180)
         """
-        slot_key = f"slot_{slot}"
-        return self.config.get(arm, {}).get(slot_key, {}).get("initial", 90)
+        return self._slot_config(arm, slot).get("initial", 90)
 
     def set_initial(self, arm, slot, value):
         """
@@ -398,18 +444,19 @@ class ServoManager:
         slot_key = f"slot_{slot}"
         self._ensure_slot_exists(arm, slot_key)
         self.config[arm][slot_key]["initial"] = value
+        self._pulses_dirty = True
         
     def set_initial_pulse(self, arm, slot, value):
         """Set initial position pulse width directly."""
         slot_key = f"slot_{slot}"
         self._ensure_slot_exists(arm, slot_key)
         self.config[arm][slot_key]["initial_pulse"] = int(value)
+        self._pulses_dirty = True
 
     def get_initial_pulse(self, arm, slot):
         """Get initial position in microseconds."""
-        slot_key = f"slot_{slot}"
         # Return saved pulse if exists, else calculate it
-        saved = self.config.get(arm, {}).get(slot_key, {}).get("initial_pulse")
+        saved = self._slot_config(arm, slot).get("initial_pulse")
         if saved is not None:
             return saved
         angle = self.get_initial(arm, slot)
@@ -427,8 +474,7 @@ class ServoManager:
         Returns:
             float: Offset angle in degrees
         """
-        slot_key = f"slot_{slot}"
-        return self.config.get(arm, {}).get(slot_key, {}).get("zero_offset", 0)
+        return self._slot_config(arm, slot).get("zero_offset", 0)
 
     def set_zero_offset(self, arm, slot, value):
         """
@@ -443,17 +489,20 @@ class ServoManager:
         slot_key = f"slot_{slot}"
         self._ensure_slot_exists(arm, slot_key)
         self.config[arm][slot_key]["zero_offset"] = value
+        self._pulses_dirty = True
+        self._dirty_arms.add(arm)
         
     def set_zero_pulse(self, arm, slot, value):
         """Set zero offset pulse width directly."""
         slot_key = f"slot_{slot}"
         self._ensure_slot_exists(arm, slot_key)
         self.config[arm][slot_key]["zero_pulse"] = int(value)
+        self._pulses_dirty = True
+        self._dirty_arms.add(arm)
 
     def get_zero_pulse(self, arm, slot):
         """Get zero offset in microseconds."""
-        slot_key = f"slot_{slot}"
-        saved = self.config.get(arm, {}).get(slot_key, {}).get("zero_pulse")
+        saved = self._slot_config(arm, slot).get("zero_pulse")
         if saved is not None:
             return saved
         angle = self.get_zero_offset(arm, slot)
@@ -470,8 +519,7 @@ class ServoManager:
         Returns:
             int: 180 or 270 (degrees)
         """
-        slot_key = f"slot_{slot}"
-        return self.config.get(arm, {}).get(slot_key, {}).get("actuation_range", 180)
+        return self._slot_config(arm, slot).get("actuation_range", 180)
 
     def set_actuation_range(self, arm, slot, value):
         """
@@ -485,16 +533,16 @@ class ServoManager:
         slot_key = f"slot_{slot}"
         self._ensure_slot_exists(arm, slot_key)
         self.config[arm][slot_key]["actuation_range"] = value
+        self._pulses_dirty = True
+        self._dirty_arms.add(arm)
 
     def get_pulse_min(self, arm, slot):
         """Get pulse_min (0-degree reference) for a given slot."""
-        slot_key = f"slot_{slot}"
-        return self.config.get(arm, {}).get(slot_key, {}).get("pulse_min", 500)
+        return self._slot_config(arm, slot).get("pulse_min", 500)
 
     def get_pulse_max(self, arm, slot):
         """Get pulse_max for a given slot."""
-        slot_key = f"slot_{slot}"
-        return self.config.get(arm, {}).get(slot_key, {}).get("pulse_max", 2500)
+        return self._slot_config(arm, slot).get("pulse_max", 2500)
 
     def set_pulse_reference(self, arm, slot, pulse_min_value):
         """
@@ -526,6 +574,8 @@ class ServoManager:
         # Set new pulse_min and pulse_max
         slot_config["pulse_min"] = new_pulse_min
         slot_config["pulse_max"] = new_pulse_min + 2000  # Fixed 2000us range
+        self._pulses_dirty = True
+        self._dirty_arms.add(arm)
 
     def get_all_slots(self):
         """
@@ -543,11 +593,10 @@ class ServoManager:
 
     def _ensure_vertices_exists(self):
         """Ensure vertices key exists in config."""
-        if "vertices" not in self.config:
-            self.config["vertices"] = {
-                "1": None, "2": None, "3": None, "4": None,
-                "5": None, "6": None, "7": None, "8": None
-            }
+        self.config.setdefault("vertices", {
+            "1": None, "2": None, "3": None, "4": None,
+            "5": None, "6": None, "7": None, "8": None
+        })
 
     def set_vertex(self, vertex_id, arm):
         """
@@ -571,6 +620,7 @@ class ServoManager:
             "owner": arm,
             "pulses": pulses
         }
+        self._dirty_vertices.add(vertex_key)
 
     def get_vertex(self, vertex_id):
         """
@@ -611,16 +661,16 @@ class ServoManager:
         self._ensure_vertices_exists()
         vertex_key = str(vertex_id)
         self.config["vertices"][vertex_key] = None
+        self._dirty_vertices.add(vertex_key)
 
     # ========== Share Point Management (Per Arm) ==========
 
     def _ensure_share_points_exists(self):
         """Ensure share_points key exists in config."""
-        if "share_points" not in self.config:
-            self.config["share_points"] = {
-                "left_arm": None,
-                "right_arm": None
-            }
+        self.config.setdefault("share_points", {
+            "left_arm": None,
+            "right_arm": None
+        })
 
     def set_share_point(self, arm):
         """
@@ -638,6 +688,7 @@ class ServoManager:
             pulses[f"slot_{slot}"] = pulse
 
         self.config["share_points"][arm] = {"pulses": pulses}
+        self._dirty_arms.add(arm)
 
     def get_share_point(self, arm):
         """
@@ -661,23 +712,68 @@ class ServoManager:
         """
         self._ensure_share_points_exists()
         self.config["share_points"][arm] = None
+        self._dirty_arms.add(arm)
 
     # ========== Geometry Precomputation ==========
 
+    def mark_geometry_dirty(self, arm=None, vertex_id=None):
+        """
+        Flag geometry for recomputation on next save.
+        Optional after writing vertices/share points directly into config:
+        compute_geometry already diffs geometry_key against the last
+        computation, and recomputes flagged arms/vertices along with the
+        ones the diff finds (nothing, if no geometry input changed).
+
+        Args:
+            arm: Arm whose base changed (None with vertex_id=None = full rebuild)
+            vertex_id: Vertex that changed (1-8)
+        """
+        if arm is None and vertex_id is None:
+            self._geometry_dirty = True
+            return
+        if arm is not None:
+            self._dirty_arms.add(arm)
+        if vertex_id is not None:
+            self._dirty_vertices.add(str(vertex_id))
+
     def compute_geometry(self):
         """
         Compute geometry section: bases, vertices, share points positions.
         Delegates to geometry_engine module for actual calculation.
+        Returns the previous result if geometry inputs are unchanged; otherwise
+        only arms/vertices whose inputs changed since the last computation
+        (or that were flagged via the setters) are recomputed.
         
         Returns:
             dict: Geometry data with bases, vertices, distances
         """
-        result = _compute_geometry(self.config)
+        key = geometry_key(self.config)
+        last_key = self._last_geometry_key
+        prev_geometry = self.config.get("geometry")
+        if prev_geometry and key == last_key:
+            result = prev_geometry
+        elif self._geometry_dirty or not prev_geometry or last_key is None:
+            result = _compute_geometry(self.config)
+        else:
+            # Diff the snapshots so edits made to self.config directly are
+            # picked up alongside the ones the setters recorded
+            dirty_arms = self._dirty_arms.union(
+                arm for arm, old, new in zip(ARM_NAMES, last_key[0], key[0]) if old != new)
+            dirty_vertices = self._dirty_vertices.union(
+                str(vid) for vid, old, new in zip(range(1, 9), last_key[1], key[1]) if old != new)
+            result = _compute_geometry(
+                self.config,
+                prev_geometry=prev_geometry,
+                dirty_arms=dirty_arms,
+                dirty_vertices=dirty_vertices
+            )
         self.config["geometry"] = result
+        self._last_geometry_key = key
+        self._geometry_dirty = False
+        self._dirty_arms = set()
+        self._dirty_vertices = set()
         return result
 
-
-
 # Test code
 if __name__ == "__main__":
     manager = ServoManager("test_config.json")
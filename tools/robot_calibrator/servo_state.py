@@ -10,6 +10,10 @@ import threading
 class ServoState:
     """
     Manages the state of servo angles for threaded communication.
+
+    Writers (GUI thread, motion planner thread) and the sender thread all
+    touch target_angles/last_sent_angles/_dirty together, so mutations stay
+    under the lock; only the single-key read in get_angle skips it.
     """
     def __init__(self):
         self._lock = threading.Lock()
@@ -17,36 +21,48 @@ class ServoState:
         self.target_angles = {}
         # Key: channel (0-15), Value: last sent angle
         self.last_sent_angles = {}
+        # Channels whose target differs from the last sent angle
+        self._dirty = set()
 
     def update_angle(self, channel, angle):
         """Update the target angle for a channel."""
         with self._lock:
             self.target_angles[channel] = angle
+            if angle != self.last_sent_angles.get(channel, -1):
+                self._dirty.add(channel)
+            else:
+                self._dirty.discard(channel)
 
     def get_pending_updates(self):
         """
         Get list of (channel, angle) for channels that need updating.
         Returns: list of tuples (channel, angle)
         """
-        updates = []
+        # Snapshot only dirty channels under the lock; build the list outside
         with self._lock:
-            for channel, angle in self.target_angles.items():
-                last = self.last_sent_angles.get(channel, -1)
-                if angle != last:
-                    updates.append((channel, angle))
-        return updates
+            pending = {channel: self.target_angles[channel] for channel in self._dirty}
+        return list(pending.items())
 
     def mark_as_sent(self, channel, angle):
         """Mark a channel's angle as successfully sent."""
         with self._lock:
             self.last_sent_angles[channel] = angle
+            target = self.target_angles.get(channel)
+            if target is None or target == angle:
+                self._dirty.discard(channel)
+            else:
+                self._dirty.add(channel)
 
     def clear_history(self):
         """Clear sent history to force updates on next command."""
         with self._lock:
             self.last_sent_angles.clear()
+            self._dirty = {channel for channel, angle in self.target_angles.items() if angle != -1}
 
     def get_angle(self, channel):
-        """Get current target angle for a channel."""
-        with self._lock:
-            return self.target_angles.get(channel, None)
+        """
+        Get current target angle for a channel.
+        Lock-free: a single dict lookup is atomic under the GIL, and
+        callers (motion planner) only need the latest published value.
+        """
+        return self.target_angles.get(channel, None)
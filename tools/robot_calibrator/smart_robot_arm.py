@@ -6,10 +6,90 @@ Handles angle conversion, safety clamping, and motor mapping.
 
 import math
 import json
+import logging
 import os
+from math import acos, atan2, cos, hypot, sin
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; kernels run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 from pulse_mapper import PulseMapper
 
+logger = logging.getLogger(__name__)
+
+# Degree/radian factors (a multiply is cheaper than math.radians/degrees)
+_DEG2RAD = math.pi / 180.0
+_RAD2DEG = 180.0 / math.pi
+
+
+# ========== Kinematics Kernels ==========
+
+@njit(cache=True, fastmath=True)
+def _ik_core(x, y, z, d1, a2, a3, sum_sq, two_a2a3, elbow_sign):
+    """
+    Geometric IK math for one target (Steps 1-5 of SmartRobotArm.solve_ik).
+    
+    Args:
+        x, y, z: Local target coordinates (mm)
+        d1, a2, a3: Base height and link lengths (mm)
+        sum_sq, two_a2a3: Precomputed a2² + a3² and 2·a2·a3
+        elbow_sign: -1.0 for "Elbow Up" (left arm), 1.0 for "Elbow Down"
+    
+    Returns:
+        tuple: (D, theta1, theta2, theta3) - distance in mm, angles in
+               mathematical degrees
+    """
+    # Step 1-2: Horizontal distance, vertical offset, total distance
+    r = hypot(x, y)
+    s = z - d1
+    D = hypot(r, s)
+    
+    # Step 3: Base Yaw
+    theta1 = atan2(x, y) * _RAD2DEG
+    
+    # Step 4: Elbow angle using law of cosines
+    cos_theta3 = (D * D - sum_sq) / two_a2a3
+    cos_theta3 = max(-1.0, min(1.0, cos_theta3))  # Clamp for numerical stability
+    theta3_rad = elbow_sign * acos(cos_theta3)
+    
+    # Step 5: Shoulder angle
+    alpha = atan2(s, r)
+    beta = atan2(a3 * sin(theta3_rad),
+                      a2 + a3 * cos(theta3_rad))
+    theta2 = (alpha - beta) * _RAD2DEG
+    
+    return D, theta1, theta2, theta3_rad * _RAD2DEG
+
+
+@njit(cache=True, fastmath=True)
+def _fk_core(theta1, theta2, theta3, d1, a2, a3):
+    """
+    Forward kinematics math for mathematical angles (degrees).
+    
+    Returns:
+        tuple: (x, y, z) in mm
+    """
+    theta1_rad = theta1 * _DEG2RAD
+    theta2_rad = theta2 * _DEG2RAD
+    theta23_rad = theta2_rad + theta3 * _DEG2RAD
+    
+    # Paired sin/cos of the same angle (fused into sincos when compiled)
+    c1, s1 = cos(theta1_rad), sin(theta1_rad)
+    c2, s2 = cos(theta2_rad), sin(theta2_rad)
+    c23, s23 = cos(theta23_rad), sin(theta23_rad)
+    
+    r = a2 * c2 + a3 * c23
+    z = d1 + a2 * s2 + a3 * s23
+    
+    return r * s1, r * c1, z
+
 
 class SmartRobotArm:
     """
@@ -26,7 +106,7 @@ class SmartRobotArm:
         Slot 6: Gripper
     """
     
-    def __init__(self, arm_name, config, driver=None):
+    def __init__(self, arm_name, config, driver=None, kinematics_tolerance=1e-3):
         """
         Initialize the robot arm controller.
         
@@ -34,10 +114,37 @@ class SmartRobotArm:
             arm_name: "left_arm" or "right_arm"
             config: Dictionary containing arm configuration from servo_config.json
             driver: SerialDriver instance (optional, for simulation)
+            kinematics_tolerance: Max per-axis input change (mm for IK, degrees
+                for FK) for which the previous IK/FK result is reused
         """
         self.arm_name = arm_name
         self.config = config
         self.driver = driver
+        self.kinematics_tolerance = kinematics_tolerance
+        
+        # Asymmetry Fix: Left Arm requires "Elbow Up" solution (negative theta3)
+        # to map correctly to physical servo limits (0-144, zero_offset=55).
+        # Right Arm uses "Elbow Down" (positive theta3).
+        self._elbow_sign = -1.0 if arm_name == "left_arm" else 1.0
+        
+        # Pulse mapper for heterogeneous motor support (180° vs 270°)
+        self.pulse_mapper = PulseMapper()
+        
+        # Link lengths, per-slot constants and IK/FK memo
+        self.reload_config()
+    
+    def reload_config(self, config=None):
+        """
+        Re-derive everything cached from the arm config and forget memoized
+        IK/FK results. Call after changing arm config.
+        
+        Args:
+            config: New arm config dict (optional, defaults to self.config,
+                    e.g. after editing it in place)
+        """
+        if config is not None:
+            self.config = config
+        config = self.config
         
         # Extract link lengths from config
         self.d1 = config.get("slot_1", {}).get("length", 107.0)  # Base height
@@ -48,20 +155,46 @@ class SmartRobotArm:
         self.max_reach = self.a2 + self.a3
         self.min_reach = abs(self.a3 - self.a2)
         
+        # Law of cosines invariants for the elbow angle
+        self._sum_sq = self.a2 * self.a2 + self.a3 * self.a3
+        self._two_a2a3 = 2 * self.a2 * self.a3
+        
         # Direction multipliers for angle conversion
         # Determined by min_pos configuration
         self._setup_directions()
         
-        # Pulse mapper for heterogeneous motor support (180° vs 270°)
-        self.pulse_mapper = PulseMapper()
+        # Per-slot constants (slots 1-4) for vectorized IK
+        self._zero_arr = np.array(self._zero[:4], dtype=np.float64)
+        self._dir_arr = np.array(self._dirs[:4], dtype=np.float64)
+        self._min_arr = np.array(self._min[:4], dtype=np.float64)
+        self._max_arr = np.array(self._max[:4], dtype=np.float64)
+        
+        # Last IK/FK inputs and results (polling loops often repeat targets)
+        self.clear_kinematics_cache()
+    
+    def clear_kinematics_cache(self):
+        """Forget memoized IK/FK results (config-derived constants are kept)."""
+        self._last_xyz = None
+        self._last_angles = None
+        self._last_fk_in = None
+        self._last_fk_out = None
     
     def _setup_directions(self):
-        """Setup direction multipliers based on motor mounting."""
+        """
+        Setup direction multipliers based on motor mounting, and cache
+        per-slot config values as tuples indexed by slot - 1.
+        """
         self.directions = {}
+        slot_cfgs, zero, mins, maxs, chans = [], [], [], [], []
         
         for slot in range(1, 7):
             slot_key = f"slot_{slot}"
             slot_config = self.config.get(slot_key, {})
+            slot_cfgs.append(slot_config)
+            zero.append(slot_config.get("zero_offset", 90.0))
+            mins.append(slot_config.get("min", 0))
+            maxs.append(slot_config.get("max", 180))
+            chans.append(slot_config.get("channel", slot - 1))
             min_pos = slot_config.get("min_pos", "bottom")
             joint_type = slot_config.get("type", "vertical")
             
@@ -80,22 +213,25 @@ class SmartRobotArm:
                 self.directions[slot] = 1 if min_pos == "open" else -1
             else:
                 self.directions[slot] = 1
+        
+        self._slot_cfgs = tuple(slot_cfgs)
+        self._zero = tuple(zero)
+        self._dirs = tuple(self.directions[slot] for slot in range(1, 7))
+        self._min = tuple(mins)
+        self._max = tuple(maxs)
+        self._chan = tuple(chans)
     
     def _get_zero_offset(self, slot):
         """Get zero offset for a slot."""
-        slot_key = f"slot_{slot}"
-        return self.config.get(slot_key, {}).get("zero_offset", 90.0)
+        return self._zero[slot - 1]
     
     def _get_limits(self, slot):
         """Get min/max limits for a slot."""
-        slot_key = f"slot_{slot}"
-        slot_cfg = self.config.get(slot_key, {})
-        return (slot_cfg.get("min", 0), slot_cfg.get("max", 180))
+        return (self._min[slot - 1], self._max[slot - 1])
     
     def _get_channel(self, slot):
         """Get PCA9685 channel for a slot."""
-        slot_key = f"slot_{slot}"
-        return self.config.get(slot_key, {}).get("channel", slot - 1)
+        return self._chan[slot - 1]
     
     def _math_to_physical(self, slot, math_angle_deg):
         """
@@ -110,11 +246,7 @@ class SmartRobotArm:
         Returns:
             float: Physical servo angle
         """
-        zero_offset = self._get_zero_offset(slot)
-        direction = self.directions.get(slot, 1)
-        
-        physical = zero_offset + (direction * math_angle_deg)
-        return physical
+        return self._zero[slot - 1] + self._dirs[slot - 1] * math_angle_deg
     
     def _clamp_angle(self, slot, angle):
         """
@@ -127,8 +259,8 @@ class SmartRobotArm:
         Returns:
             float: Clamped angle
         """
-        min_limit, max_limit = self._get_limits(slot)
-        return max(min_limit, min(max_limit, angle))
+        i = slot - 1
+        return max(self._min[i], min(self._max[i], angle))
     
     def solve_ik(self, x, y, z):
         """
@@ -145,12 +277,16 @@ class SmartRobotArm:
         Raises:
             ValueError: If target is unreachable
         """
-        # Step 1: Calculate horizontal distance and vertical offset
-        r = math.sqrt(x**2 + y**2)  # Horizontal distance to target
-        s = z - self.d1            # Vertical distance (above base)
+        # Reuse the previous solution while the target stays within tolerance
+        last = self._last_xyz
+        if last is not None:
+            tol = self.kinematics_tolerance
+            if abs(x - last[0]) < tol and abs(y - last[1]) < tol and abs(z - last[2]) < tol:
+                return list(self._last_angles)
         
-        # Step 2: Calculate total distance
-        D = math.sqrt(r**2 + s**2)
+        # Steps 1-5: Geometric solution (compiled kernel when Numba is available)
+        D, theta1_math, theta2_math, theta3_math = _ik_core(
+            x, y, z, self.d1, self.a2, self.a3, self._sum_sq, self._two_a2a3, self._elbow_sign)
         
         # Reachability check
         if D > self.max_reach:
@@ -158,26 +294,6 @@ class SmartRobotArm:
         if D < self.min_reach:
             raise ValueError(f"Target too close: D={D:.1f}mm below min reach {self.min_reach:.1f}mm")
         
-        # Step 3: Calculate Base Yaw (theta1)
-        theta1_math = math.degrees(math.atan2(x, y))
-        
-        # Step 4: Calculate Elbow angle (theta3) using law of cosines
-        cos_theta3 = (D**2 - self.a2**2 - self.a3**2) / (2 * self.a2 * self.a3)
-        cos_theta3 = max(-1, min(1, cos_theta3))  # Clamp for numerical stability
-        theta3_math = math.degrees(math.acos(cos_theta3))
-        
-        # Asymmetry Fix: Left Arm requires "Elbow Up" solution (negative theta3)
-        # to map correctly to physical servo limits (0-144, zero_offset=55).
-        # Right Arm uses "Elbow Down" (positive theta3).
-        if self.arm_name == "left_arm":
-            theta3_math = -theta3_math
-        
-        # Step 5: Calculate Shoulder angle (theta2)
-        alpha = math.atan2(s, r)
-        beta = math.atan2(self.a3 * math.sin(math.radians(theta3_math)),
-                         self.a2 + self.a3 * math.cos(math.radians(theta3_math)))
-        theta2_math = math.degrees(alpha - beta)
-        
         # Step 6: Wrist Yaw (theta4) - keep horizontal by default
         theta4_math = 0
         
@@ -193,8 +309,50 @@ class SmartRobotArm:
         theta3_phy = self._clamp_angle(3, theta3_phy)
         theta4_phy = self._clamp_angle(4, theta4_phy)
         
+        self._last_xyz = (x, y, z)
+        self._last_angles = (theta1_phy, theta2_phy, theta3_phy, theta4_phy)
         return [theta1_phy, theta2_phy, theta3_phy, theta4_phy]
     
+    def solve_ik_batch(self, xyz):
+        """
+        Vectorized 4-DOF IK for many targets at once (e.g. trajectory waypoints).
+        Same math as solve_ik, evaluated with NumPy over all rows.
+        
+        Args:
+            xyz: Array-like of shape (N, 3) with local (x, y, z) in mm
+        
+        Returns:
+            np.ndarray: Shape (N, 4), [theta1, theta2, theta3, theta4] in physical
+                        degrees per row. Rows of unreachable targets are NaN.
+        """
+        xyz = np.asarray(xyz, dtype=np.float64).reshape(-1, 3)
+        x, y, z = xyz[:, 0], xyz[:, 1], xyz[:, 2]
+        
+        # Steps 1-2: Horizontal distance, vertical offset, total distance
+        r = np.hypot(x, y)
+        s = z - self.d1
+        D = np.hypot(r, s)
+        reachable = (D <= self.max_reach) & (D >= self.min_reach)
+        
+        # Step 3: Base Yaw
+        theta1 = np.arctan2(x, y)
+        
+        # Step 4: Elbow (law of cosines), Left Arm uses "Elbow Up" (negative)
+        cos_theta3 = (D * D - self._sum_sq) / self._two_a2a3
+        theta3 = self._elbow_sign * np.arccos(np.clip(cos_theta3, -1.0, 1.0))
+        
+        # Step 5: Shoulder
+        theta2 = np.arctan2(s, r) - np.arctan2(self.a3 * np.sin(theta3),
+                                               self.a2 + self.a3 * np.cos(theta3))
+        
+        # Step 6: Wrist Yaw stays at 0
+        math_deg = np.degrees(np.stack([theta1, theta2, theta3, np.zeros_like(theta1)], axis=1))
+        
+        # Steps 7-8: Physical conversion and safety clamping
+        physical = np.clip(self._zero_arr + self._dir_arr * math_deg, self._min_arr, self._max_arr)
+        physical[~reachable] = np.nan
+        return physical
+    
     def apply_motion(self, angles, duration=1.0):
         """
         Apply calculated angles to servos.
@@ -204,19 +362,16 @@ class SmartRobotArm:
             duration: Motion duration in seconds (for smooth motion)
         """
         if self.driver is None:
-            print(f"[SIM] {self.arm_name}: Moving to angles {[f'{a:.1f}' for a in angles]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[SIM] %s: Moving to angles %s",
+                             self.arm_name, [f"{a:.1f}" for a in angles])
             return
         
-        for slot in range(1, 5):
-            channel = self._get_channel(slot)
-            physical_angle = angles[slot - 1]
-            
+        for i in range(4):
             # Convert physical angle to pulse width (Pass-Through mode)
-            slot_key = f"slot_{slot}"
-            motor_config = self.config.get(slot_key, {})
-            pulse_us = self.pulse_mapper.physical_to_pulse(physical_angle, motor_config)
+            pulse_us = self.pulse_mapper.physical_to_pulse(angles[i], self._slot_cfgs[i])
             
-            self.driver.write_pulse(channel, pulse_us)
+            self.driver.write_pulse(self._chan[i], pulse_us)
     
     def get_servo_targets(self, angles):
         """
@@ -229,13 +384,15 @@ class SmartRobotArm:
             list: List of (channel, angle) tuples
         """
         targets = []
-        for slot in range(1, len(angles) + 1):
-            channel = self._get_channel(slot)
-            physical_angle = angles[slot - 1]
+        num_slots = len(self._slot_cfgs)
+        for i, physical_angle in enumerate(angles):
+            if i < num_slots:
+                channel, motor_config = self._chan[i], self._slot_cfgs[i]
+            else:
+                # Beyond slot 6: treated as an unconfigured slot (default channel/config)
+                channel, motor_config = i, {}
             
             # Convert physical angle to pulse width (Pass-Through mode)
-            slot_key = f"slot_{slot}"
-            motor_config = self.config.get(slot_key, {})
             pulse_us = self.pulse_mapper.physical_to_pulse(physical_angle, motor_config)
             
             targets.append((channel, pulse_us))
@@ -248,10 +405,9 @@ class SmartRobotArm:
         Args:
             state: "open" or "close"
         """
-        slot = 6
-        slot_config = self.config.get("slot_6", {})
-        min_angle = slot_config.get("min", 0)
-        max_angle = slot_config.get("max", 180)
+        slot_config = self._slot_cfgs[5]
+        min_angle = self._min[5]
+        max_angle = self._max[5]
         min_pos = slot_config.get("min_pos", "open")
         
         if min_pos == "open":
@@ -260,13 +416,12 @@ class SmartRobotArm:
             target = max_angle if state == "open" else min_angle
         
         if self.driver is None:
-            print(f"[SIM] {self.arm_name}: Gripper {state} -> {target}deg")
+            logger.debug("[SIM] %s: Gripper %s -> %sdeg", self.arm_name, state, target)
             return
         
-        channel = self._get_channel(6)
+        channel = self._chan[5]
         
         # Convert physical angle to pulse width (Pass-Through mode)
-        slot_config = self.config.get("slot_6", {})
         pulse_us = self.pulse_mapper.physical_to_pulse(target, slot_config)
         
         self.driver.write_pulse(channel, pulse_us)
@@ -281,28 +436,33 @@ class SmartRobotArm:
         Returns:
             tuple: (x, y, z) in mm
         """
-        # Convert physical to mathematical angles
-        theta1 = (angles[0] - self._get_zero_offset(1)) / self.directions.get(1, 1)
-        theta2 = (angles[1] - self._get_zero_offset(2)) / self.directions.get(2, 1)
-        theta3 = (angles[2] - self._get_zero_offset(3)) / self.directions.get(3, 1)
-        
-        # Forward kinematics
-        theta1_rad = math.radians(theta1)
-        theta2_rad = math.radians(theta2)
-        theta3_rad = math.radians(theta3)
+        # Reuse the previous position while joint angles stay within tolerance
+        last = self._last_fk_in
+        if last is not None:
+            tol = self.kinematics_tolerance
+            if (abs(angles[0] - last[0]) < tol and abs(angles[1] - last[1]) < tol
+                    and abs(angles[2] - last[2]) < tol):
+                return self._last_fk_out
         
-        # Calculate position
-        r = self.a2 * math.cos(theta2_rad) + self.a3 * math.cos(theta2_rad + theta3_rad)
-        z = self.d1 + self.a2 * math.sin(theta2_rad) + self.a3 * math.sin(theta2_rad + theta3_rad)
+        # Convert physical to mathematical angles
+        zero, dirs = self._zero, self._dirs
+        theta1 = (angles[0] - zero[0]) / dirs[0]
+        theta2 = (angles[1] - zero[1]) / dirs[1]
+        theta3 = (angles[2] - zero[2]) / dirs[2]
         
-        x = r * math.sin(theta1_rad)
-        y = r * math.cos(theta1_rad)
+        # Forward kinematics (compiled kernel when Numba is available)
+        position = tuple(_fk_core(theta1, theta2, theta3, self.d1, self.a2, self.a3))
         
-        return (x, y, z)
+        self._last_fk_in = (angles[0], angles[1], angles[2])
+        self._last_fk_out = position
+        return position
 
 
 # Test code
 if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.DEBUG)  # Show [SIM] output for this module only
+    
     # Load config
     config_path = os.path.join(os.path.dirname(__file__), "servo_config.json")
     
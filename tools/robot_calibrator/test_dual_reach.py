@@ -2,10 +2,11 @@
 Test script for Dual Reach Protocol kinematics implementation.
 Verifies that compute_3d_reach produces expected values based on manual calculations.
 """
-from servo_manager import ServoManager
+from config_cache import get_manager
+from geometry_engine import compute_3d_reach
 
 def test_dual_reach():
-    m = ServoManager()
+    m = get_manager()
     
     # Expected values from manual calculations (based on kinematics prompt)
     expected = {
@@ -28,7 +29,7 @@ def test_dual_reach():
             continue
             
         owner = vertex.get("owner")
-        result = m.compute_3d_reach(owner, vertex)
+        result = compute_3d_reach(m.config, owner, vertex)
         exp = expected[str(vid)]
         
         print(f"\n=== Vertex {vid} ({owner}) ===")
@@ -73,7 +74,7 @@ def test_dual_reach():
 
 def test_geometry_output():
     """Test that compute_geometry includes Z coordinates."""
-    m = ServoManager()
+    m = get_manager()
     
     print("\n" + "=" * 60)
     print("Geometry Output Test")
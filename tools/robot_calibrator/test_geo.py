@@ -1,12 +1,12 @@
 """Test geometry engine module directly."""
 
-from servo_manager import ServoManager
+from config_cache import get_manager
 from geometry_engine import compute_reach, compute_geometry
 import math
 
 
 # Load config via ServoManager
-m = ServoManager()
+m = get_manager()
 
 # Check V1 and V3 reach using geometry_engine functions
 v1 = m.config['vertices']['1']
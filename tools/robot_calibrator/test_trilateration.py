@@ -5,60 +5,53 @@ Uses circle intersection instead of yaw-based transform.
 import sys
 sys.path.insert(0, ".")
 
-import json
 import math
-from geometry_engine import compute_reach, compute_yaw
 
-with open("servo_config.json", "r") as f:
-    config = json.load(f)
+import numpy as np
 
+from config_cache import get_config, get_geometry
+from geometry_engine import compute_reach, compute_yaw, link_lengths
 
-def circle_intersection(c1, r1, c2, r2):
-    """
-    Find intersection points of two circles.
-    Returns tuple of two points or None if no intersection.
+_DEG2RAD = math.pi / 180.0
+
+config = get_config()
+
+
+def circle_intersection_vec(c1, r1, c2, r2):
     """
-    x1, y1 = c1
-    x2, y2 = c2
-    d = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+    Intersection points of N circle pairs.
     
-    # Check if circles intersect
-    if d > r1 + r2 or d < abs(r1 - r2) or d == 0:
-        return None
+    Centers may be a single (2,) pair shared by all rows, in which case the
+    center distance is computed only once.
     
-    a = (r1 ** 2 - r2 ** 2 + d ** 2) / (2 * d)
-    h_sq = r1 ** 2 - a ** 2
-    if h_sq < 0:
-        return None
-    h = math.sqrt(h_sq)
+    Args:
+        c1, c2: (N, 2) or (2,) circle centers
+        r1, r2: (N,) radii
     
-    # Point on line between centers
-    px = x1 + a * (x2 - x1) / d
-    py = y1 + a * (y2 - y1) / d
+    Returns:
+        tuple: ((N, 2, 2) intersection points [p1, p2] per row,
+                (N,) bool mask of rows that actually intersect)
+    """
+    c1 = np.asarray(c1, dtype=np.float64)
+    c2 = np.asarray(c2, dtype=np.float64)
+    r1 = np.asarray(r1, dtype=np.float64)
+    r2 = np.asarray(r2, dtype=np.float64)
     
-    # Two intersection points
-    p1 = (px + h * (y2 - y1) / d, py - h * (x2 - x1) / d)
-    p2 = (px - h * (y2 - y1) / d, py + h * (x2 - x1) / d)
+    delta = c2 - c1
+    d = np.hypot(delta[..., 0], delta[..., 1])
     
-    return p1, p2
-
-
-def select_by_yaw(p1, p2, base, yaw, share_point=(0, 0)):
-    """
-    Select the point that matches the expected position.
-    Use the old yaw-based calculation as reference.
-    """
-    # Calculate expected position using old method (for reference only)
-    # Old method: vx = base_x + reach * (-sin(yaw)), vy = base_y + reach * cos(yaw)
-    reach = math.sqrt((p1[0] - base[0])**2 + (p1[1] - base[1])**2)
-    expected_x = base[0] + reach * (-math.sin(yaw))
-    expected_y = base[1] + reach * math.cos(yaw)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = (r1 * r1 - r2 * r2 + d * d) / (2 * d)
+        h_sq = r1 * r1 - a * a
+        valid = (d <= r1 + r2) & (d >= np.abs(r1 - r2)) & (d != 0) & (h_sq >= 0)
+        h = np.sqrt(np.where(valid, h_sq, 0.0))
+        unit = delta / d[..., None]
     
-    # Choose the point closer to expected position
-    dist1 = math.sqrt((p1[0] - expected_x)**2 + (p1[1] - expected_y)**2)
-    dist2 = math.sqrt((p2[0] - expected_x)**2 + (p2[1] - expected_y)**2)
+    # Point on line between centers, offset perpendicular by h
+    mid = c1 + a[:, None] * unit
+    offset = h[:, None] * np.stack([unit[..., 1], -unit[..., 0]], axis=-1)
     
-    return p1 if dist1 < dist2 else p2
+    return np.stack([mid + offset, mid - offset], axis=1), valid
 
 
 def compute_share_to_vertex_distance(config, arm, vertex):
@@ -66,12 +59,8 @@ def compute_share_to_vertex_distance(config, arm, vertex):
     Compute distance from Share Point (origin) to Vertex using FK.
     This is the full 3D reach from share point.
     """
-    # Get slot configs
-    a2 = config.get(arm, {}).get("slot_2", {}).get("length", 0)
-    a3 = config.get(arm, {}).get("slot_3", {}).get("length", 0)
-    a4 = config.get(arm, {}).get("slot_4", {}).get("length", 0)
-    a5 = config.get(arm, {}).get("slot_5", {}).get("length", 0)
-    a6 = config.get(arm, {}).get("slot_6", {}).get("length", 0)
+    # Get link lengths
+    _, a2, a3, a4, a5, a6 = link_lengths(config, arm)
     
     # Get angles
     angles = vertex.get("angles", {})
@@ -83,9 +72,9 @@ def compute_share_to_vertex_distance(config, arm, vertex):
         min_pos = slot_cfg.get("min_pos", "")
         
         if min_pos in ["top", "left", "cw"]:
-            return math.radians(zero_offset - physical)
+            return (zero_offset - physical) * _DEG2RAD
         else:
-            return math.radians(physical - zero_offset)
+            return (physical - zero_offset) * _DEG2RAD
     
     theta2 = get_logical_angle(2)
     theta3 = get_logical_angle(3)
@@ -95,49 +84,80 @@ def compute_share_to_vertex_distance(config, arm, vertex):
     angle_elbow = theta2 + theta3
     angle_wrist = theta2 + theta3 + theta4
     
-    fk_x = (a2 * math.cos(angle_shoulder) +
-            a3 * math.cos(angle_elbow) +
-            (a4 + a5 + a6) * math.cos(angle_wrist))
+    sin, cos = math.sin, math.cos
+    fk_x = (a2 * cos(angle_shoulder) +
+            a3 * cos(angle_elbow) +
+            (a4 + a5 + a6) * cos(angle_wrist))
     
-    fk_y = (a2 * math.sin(angle_shoulder) +
-            a3 * math.sin(angle_elbow) +
-            (a4 + a5 + a6) * math.sin(angle_wrist))
+    fk_y = (a2 * sin(angle_shoulder) +
+            a3 * sin(angle_elbow) +
+            (a4 + a5 + a6) * sin(angle_wrist))
     
-    return math.sqrt(fk_x ** 2 + fk_y ** 2)
+    return math.hypot(fk_x, fk_y)
 
 
-def compute_vertex_trilateration(config, base_pos, vertex_data, arm):
+def compute_vertices_trilateration(config, base_positions, vertices, arms):
     """
-    Compute vertex position using trilateration.
+    Compute vertex positions using trilateration, all vertices at once.
     
     Uses:
     - Share Point (origin) to Vertex distance
     - Base to Vertex distance (reach)
     - Yaw only for selecting correct intersection point
-    """
-    # Get reach (Base->Vertex distance)
-    reach_horiz, reach_3d = compute_reach(config, arm, vertex_data, is_vertex=True)
-    
-    # Get Share->Vertex distance
-    share_to_vertex = compute_share_to_vertex_distance(config, arm, vertex_data)
-    
-    # Get yaw for direction selection only
-    yaw = compute_yaw(config, arm, vertex_data)
-    
-    # Find circle intersections
-    share_point = (0, 0)
-    intersections = circle_intersection(share_point, share_to_vertex, base_pos, reach_3d)
     
-    if intersections is None:
-        # Fallback to old method if no intersection
-        vx = base_pos[0] + reach_horiz * (-math.sin(yaw))
-        vy = base_pos[1] + reach_horiz * math.cos(yaw)
-        return (vx, vy), reach_3d, "fallback"
+    Args:
+        config: Full servo configuration
+        base_positions: (N, 2) base position of each vertex's owner arm
+            (the same for all vertices of one arm)
+        vertices: List of N vertex dicts
+        arms: (N,) array of owner arm names
     
-    # Select correct intersection based on yaw direction
-    vertex_pos = select_by_yaw(intersections[0], intersections[1], base_pos, yaw)
+    Returns:
+        tuple: ((N, 2) positions, (N,) 3D reaches, list of N method names)
+    """
+    # Per-vertex scalars: reach (Base->Vertex), Share->Vertex distance, yaw
+    reaches = np.array([compute_reach(config, arm, v, is_vertex=True)
+                        for arm, v in zip(arms, vertices)], dtype=np.float64)
+    reach_horiz, reach_3d = reaches[:, 0], reaches[:, 1]
+    share_to_vertex = np.array([compute_share_to_vertex_distance(config, arm, v)
+                                for arm, v in zip(arms, vertices)], dtype=np.float64)
+    yaws = np.array([compute_yaw(config, arm, v)
+                     for arm, v in zip(arms, vertices)], dtype=np.float64)
+    
+    bases = np.asarray(base_positions, dtype=np.float64)
+    direction = np.stack([-np.sin(yaws), np.cos(yaws)], axis=1)
+    
+    # Find circle intersections (Share Point at origin), one call per owner
+    # arm: its vertices share the same center pair and differ only in radii
+    points = np.empty((len(arms), 2, 2))
+    valid = np.empty(len(arms), dtype=bool)
+    for arm in np.unique(arms):
+        rows = np.flatnonzero(arms == arm)
+        points[rows], valid[rows] = circle_intersection_vec(
+            (0.0, 0.0), share_to_vertex[rows], bases[rows[0]], reach_3d[rows])
+    
+    # Select correct intersection: both points lie on the same circle around
+    # the base, so the one further along the yaw direction is the expected one
+    along = np.sum((points[:, 0] - points[:, 1]) * direction, axis=1)
+    chosen = np.where((along > 0)[:, None], points[:, 0], points[:, 1])
+    
+    # Fallback to old method if no intersection
+    fallback = bases + reach_horiz[:, None] * direction
+    positions = np.where(valid[:, None], chosen, fallback)
+    methods = ["trilateration" if ok else "fallback" for ok in valid]
+    
+    return positions, reach_3d, methods
+
+
+def pairwise_distances(points):
+    """
+    Pairwise 2D distance matrix of (N, 2) points.
     
-    return vertex_pos, reach_3d, "trilateration"
+    The square root is taken in place on the squared-distance matrix.
+    """
+    diff = points[:, None] - points[None]
+    dist = np.einsum("ijk,ijk->ij", diff, diff)
+    return np.sqrt(dist, out=dist)
 
 
 # Test the new approach
@@ -147,9 +167,7 @@ print("=" * 75)
 print()
 
 # Get base positions (using existing geometry_engine logic)
-from geometry_engine import compute_geometry
-
-geometry = compute_geometry(config)
+_, geometry = get_geometry()
 bases = geometry.get("bases", {})
 
 lb = (bases.get("left_arm", {}).get("x", 0), bases.get("left_arm", {}).get("y", 0))
@@ -159,19 +177,19 @@ print(f"Left Base:  ({lb[0]:.1f}, {lb[1]:.1f})")
 print(f"Right Base: ({rb[0]:.1f}, {rb[1]:.1f})")
 print()
 
-# Compute vertices with trilateration
+# Columnar vertex data: one array entry per recorded vertex among V1-V4
 vertices_config = config.get("vertices", {})
-new_vertices = {}
+vids = [vid for vid in ("1", "2", "3", "4") if vertices_config.get(vid)]
+v_list = [vertices_config[vid] for vid in vids]
+owners = np.array([v.get("owner") for v in v_list])
+base_arr = np.where((owners == "left_arm")[:, None], np.array(lb), np.array(rb))
 
-for vid in ["1", "2", "3", "4"]:
-    v_data = vertices_config.get(vid, {})
-    owner = v_data.get("owner")
-    base = lb if owner == "left_arm" else rb
-    
-    pos, reach, method = compute_vertex_trilateration(config, base, v_data, owner)
-    new_vertices[vid] = {"pos": pos, "reach": reach, "method": method}
-    
-    print(f"V{vid}: ({pos[0]:.1f}, {pos[1]:.1f}) - reach: {reach:.1f}mm - method: {method}")
+# Compute vertices with trilateration
+positions, reaches, methods = compute_vertices_trilateration(config, base_arr, v_list, owners)
+
+print("\n".join(
+    f"V{vid}: ({pos[0]:.1f}, {pos[1]:.1f}) - reach: {reach:.1f}mm - method: {method}"
+    for vid, pos, reach, method in zip(vids, positions, reaches, methods)))
 
 print()
 
@@ -186,18 +204,17 @@ measured = {
 }
 
 
-def dist(p1, p2):
-    return math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2)
+# Pairwise V-V distance matrix, indexed by vertex order in vids
+vv = pairwise_distances(positions)
+index = {vid: i for i, vid in enumerate(vids)}
 
-
-calculated = {
-    "v1_v2": dist(new_vertices["1"]["pos"], new_vertices["2"]["pos"]),
-    "v2_v3": dist(new_vertices["2"]["pos"], new_vertices["3"]["pos"]),
-    "v3_v4": dist(new_vertices["3"]["pos"], new_vertices["4"]["pos"]),
-    "v4_v1": dist(new_vertices["4"]["pos"], new_vertices["1"]["pos"]),
-    "v1_v3": dist(new_vertices["1"]["pos"], new_vertices["3"]["pos"]),
-    "v2_v4": dist(new_vertices["2"]["pos"], new_vertices["4"]["pos"]),
-}
+# Row/column of each measured pair ("v1_v2" -> vertices "1", "2")
+keys = list(measured)
+pairs = np.array([[index[v[1:]] for v in key.split("_")] for key in keys])
+meas_arr = np.array([measured[key] for key in keys], dtype=np.float64)
+calc_arr = vv[pairs[:, 0], pairs[:, 1]]
+errs = calc_arr - meas_arr
+status = np.where(np.abs(errs) < 15, "[OK]", "[BAD]")
 
 print("=" * 75)
 print("V-V DISTANCE COMPARISON (Trilateration)")
@@ -205,10 +222,6 @@ print("=" * 75)
 print()
 print(f"{'Item':<15} {'Measured':>10} {'Calculated':>12} {'Error':>10} {'Status':>8}")
 print("-" * 60)
-
-for key in measured:
-    m = measured[key]
-    c = calculated[key]
-    err = c - m
-    status = "[OK]" if abs(err) < 15 else "[BAD]"
-    print(f"{key:<15} {m:>10.1f} {c:>12.1f} {err:>+10.1f} {status:>8}")
+print("\n".join(
+    f"{key:<15} {m:>10.1f} {c:>12.1f} {err:>+10.1f} {st:>8}"
+    for key, m, c, err, st in zip(keys, meas_arr, calc_arr, errs, status)))
@@ -7,17 +7,13 @@ import math
 sys.path.insert(0, os.path.dirname(__file__))
 
 # Import core modules only (no matplotlib)
-from geometry_engine import compute_geometry, compute_reach, compute_yaw
-import json
+from config_cache import get_geometry
+from geometry_engine import compute_reach, compute_yaw, link_lengths
 
-# Load config
-config_path = os.path.join(os.path.dirname(__file__), "servo_config.json")
-with open(config_path, 'r', encoding='utf-8') as f:
-    cfg = json.load(f)
+# Load config and compute geometry (cached per config file version)
+cfg, geo = get_geometry()
 print("Config loaded successfully")
 
-# Compute geometry
-geo = compute_geometry(cfg)
 print(f"Geometry computed: {len(geo['bases'])} bases, {len(geo['vertices'])} vertices")
 
 # Test compute_base_info logic (inline)
@@ -51,16 +47,10 @@ try:
     print("\nIKSolver import: OK")
     
     # Create solver
-    arm = cfg.get("right_arm", {})
-    link_lengths = {
-        'd1': arm.get("slot_1", {}).get("length", 107.0),
-        'a2': arm.get("slot_2", {}).get("length", 105.0),
-        'a3': arm.get("slot_3", {}).get("length", 150.0),
-        'a4': arm.get("slot_4", {}).get("length", 65.0) + 
-              arm.get("slot_5", {}).get("length", 0.0) + 
-              arm.get("slot_6", {}).get("length", 115.0)
-    }
-    solver = IKSolver(link_lengths, {})
+    d1, a2, a3, a4, a5, a6 = link_lengths(cfg, "right_arm",
+                                          (107.0, 105.0, 150.0, 65.0, 0.0, 115.0))
+    lengths = {'d1': d1, 'a2': a2, 'a3': a3, 'a4': a4 + a5 + a6}
+    solver = IKSolver(lengths, {})
     result = solver.solve((100, 200, 50))
     print(f"IKSolver test: reachable={result.is_reachable}")
     if result.best_solution:
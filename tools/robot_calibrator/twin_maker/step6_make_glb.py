@@ -2,95 +2,273 @@ import trimesh
 import numpy as np
 import json
 import os
+import struct
+
+try:
+    import ijson  # Optional: stream 'objects' instead of loading the whole file
+except ImportError:
+    ijson = None
 
 # Configuration
 INPUT_FILENAME = './output/51_step5_vr.json'
 OUTPUT_PATH = './output/51_dice_digital_twin.glb'
+# Store dice as EXT_mesh_gpu_instancing batches (one node per color) instead
+# of one node per dice. Viewers without the extension show a single box.
+GPU_INSTANCING = False
+
+_EYE4 = np.eye(4)
+_EMPTY = {}
+_ZERO_XYZ = {'x': 0, 'y': 0, 'z': 0}
+_ONE_XYZ = {'x': 1, 'y': 1, 'z': 1}
+
+def _rgba(r, g, b, a=255):
+    """Read-only uint8 RGBA color, shared by every mesh that uses it."""
+    color = np.array([r, g, b, a], dtype=np.uint8)
+    color.flags.writeable = False
+    return color
+
+# Color name -> RGBA 0-255, built once at import
+_CMAP = {
+    'red':   _rgba(255, 0, 0),
+    'white': _rgba(240, 240, 240), # Slightly off-white for better visibility
+    'blue':  _rgba(0, 0, 255),
+    'green': _rgba(0, 255, 0),
+    "yellow": _rgba(255, 255, 0),
+    "orange": _rgba(255, 165, 0),
+    "pink":   _rgba(255, 192, 203),
+    # 'black': _rgba(20, 20, 20),
+}
+_DEFAULT_RGBA = _rgba(128, 128, 128) # Default gray
 
 def get_color_rgba(color_name):
-    """Maps string color names to RGBA 0-255 values."""
-    cmap = {
-        'red':   [255, 0, 0, 255],
-        'white': [240, 240, 240, 255], # Slightly off-white for better visibility
-        'blue':  [0, 0, 255, 255],
-        'green': [0, 255, 0, 255],
-        "yellow": [255, 255, 0, 255],
-        "orange": [255, 165, 0, 255],
-        "pink":   [255, 192, 203, 255],
-        # 'black': [20, 20, 20, 255],
+    """Maps string color names to RGBA 0-255 values (read-only uint8 array)."""
+    return _CMAP.get(color_name.lower(), _DEFAULT_RGBA)
+
+def iter_objects(json_input_path):
+    """Yields the entries of the input's 'objects' array one at a time."""
+    if ijson is None:
+        with open(json_input_path, 'r') as f:
+            yield from json.load(f).get('objects', [])
+        return
+    with open(json_input_path, 'rb') as f:
+        yield from ijson.items(f, 'objects.item', use_float=True)
+
+def build_transforms(positions, eulers_deg, scales):
+    """
+    Builds the node transforms T @ R @ S for N objects at once.
+    Rotation matches euler_matrix(..., axes='sxyz'), i.e. R = Rz @ Ry @ Rx.
+
+    positions, eulers_deg, scales: (N, 3) arrays. Returns (N, 4, 4).
+    """
+    transforms = np.empty((len(positions), 4, 4))
+    transforms[:] = _EYE4
+
+    # Rotation: only rows with a non-zero angle (axis-aligned dice keep identity)
+    rotated = np.any(eulers_deg != 0, axis=1)
+    if rotated.any():
+        # Dice usually share a few discrete poses: build each distinct one once
+        unique_eulers, pose_index = np.unique(eulers_deg[rotated], axis=0, return_inverse=True)
+        rad = np.deg2rad(unique_eulers)
+        cx, cy, cz = np.cos(rad).T
+        sx, sy, sz = np.sin(rad).T
+
+        # Closed form of Rz @ Ry @ Rx
+        rot = np.empty((len(rad), 3, 3))
+        rot[:, 0, 0] = cy * cz
+        rot[:, 0, 1] = sx * sy * cz - cx * sz
+        rot[:, 0, 2] = cx * sy * cz + sx * sz
+        rot[:, 1, 0] = cy * sz
+        rot[:, 1, 1] = sx * sy * sz + cx * cz
+        rot[:, 1, 2] = cx * sy * sz - sx * cz
+        rot[:, 2, 0] = -sy
+        rot[:, 2, 1] = sx * cy
+        rot[:, 2, 2] = cx * cy
+        rot = rot[pose_index.reshape(-1)]
+        rot *= scales[rotated, None, :]  # Scale folds into rotation columns
+        transforms[rotated, :3, :3] = rot
+
+    # Unrotated dice: scale is just the diagonal
+    scaled = np.flatnonzero(~rotated & np.any(scales != 1, axis=1))
+    if scaled.size:
+        transforms[scaled[:, None], [0, 1, 2], [0, 1, 2]] = scales[scaled]
+
+    transforms[:, :3, 3] = positions
+    return transforms
+
+def euler_to_quaternions(eulers_deg):
+    """
+    Converts (N, 3) Euler degrees to (N, 4) glTF quaternions (x, y, z, w).
+    Same rotation as build_transforms, i.e. q = qz * qy * qx.
+    """
+    half = np.deg2rad(np.asarray(eulers_deg, dtype=float)) * 0.5
+    cx, cy, cz = np.cos(half).T
+    sx, sy, sz = np.sin(half).T
+    quats = np.empty((len(half), 4))
+    quats[:, 0] = sx * cy * cz - cx * sy * sz
+    quats[:, 1] = cx * sy * cz + sx * cy * sz
+    quats[:, 2] = cx * cy * sz - sx * sy * cz
+    quats[:, 3] = cx * cy * cz + sx * sy * sz
+    return quats
+
+def _pad4(data, fill):
+    """Pads a GLB chunk to a 4-byte boundary."""
+    return data + fill * (-len(data) % 4)
+
+def _write_glb(glb_output_path, gltf, blobs):
+    """
+    Adds one buffer view per blob to gltf and writes the GLB file.
+
+    The blobs are streamed into the BIN chunk one by one, so the binary
+    payload is never concatenated in memory.
+    """
+    buffer_views, offset = [], 0
+    for blob in blobs:
+        buffer_views.append({'buffer': 0, 'byteOffset': offset, 'byteLength': blob.nbytes})
+        offset += blob.nbytes  # uint32 / float32 / RGBA8 data keeps 4-byte alignment
+    gltf['bufferViews'] = buffer_views
+    gltf['buffers'] = [{'byteLength': offset}]
+
+    json_chunk = _pad4(json.dumps(gltf, separators=(',', ':')).encode('utf-8'), b' ')
+    bin_padding = b'\0' * (-offset % 4)
+    bin_length = offset + len(bin_padding)
+
+    with open(glb_output_path, 'wb') as f:
+        f.write(struct.pack('<4sII', b'glTF', 2, 12 + 8 + len(json_chunk) + 8 + bin_length))
+        f.write(struct.pack('<I4s', len(json_chunk), b'JSON'))
+        f.write(json_chunk)
+        f.write(struct.pack('<I4s', bin_length, b'BIN\0'))
+        for blob in blobs:
+            f.write(memoryview(blob).cast('B'))
+        f.write(bin_padding)
+
+def _box_accessors(vertices, faces, mesh_colors):
+    """
+    Shared box geometry: blobs, accessors and one mesh per color.
+
+    The box indices and positions are stored once; each mesh only adds its
+    vertex colors (COLOR_0). Returns (blobs, accessors, meshes); blobs are
+    contiguous arrays written to the BIN chunk as-is.
+    """
+    indices = np.ascontiguousarray(faces, dtype=np.uint32).reshape(-1)
+    positions = np.ascontiguousarray(vertices, dtype=np.float32)
+    mesh_colors = np.asarray(mesh_colors, dtype=np.uint8).reshape(-1, 4)
+    vertex_colors = np.broadcast_to(mesh_colors[:, None, :], (len(mesh_colors), len(positions), 4))
+
+    blobs = [indices, positions] + [np.ascontiguousarray(c) for c in vertex_colors]
+    accessors = [
+        {'bufferView': 0, 'componentType': 5125, 'count': len(indices), 'type': 'SCALAR'},
+        {'bufferView': 1, 'componentType': 5126, 'count': len(positions), 'type': 'VEC3',
+         'min': positions.min(axis=0).tolist(), 'max': positions.max(axis=0).tolist()},
+    ]
+    meshes = []
+    for i in range(len(mesh_colors)):
+        accessors.append({'bufferView': 2 + i, 'componentType': 5121, 'normalized': True,
+                          'count': len(positions), 'type': 'VEC4'})
+        meshes.append({'primitives': [{'attributes': {'POSITION': 1, 'COLOR_0': 2 + i},
+                                       'indices': 0, 'mode': 4}]})
+    return blobs, accessors, meshes
+
+def write_dice_glb(glb_output_path, vertices, faces, mesh_colors, node_names, node_meshes, transforms):
+    """
+    Writes a GLB in which every dice node references one shared box.
+
+    vertices, faces: Box geometry. mesh_colors: (M, 4) uint8 RGBA.
+    node_names, node_meshes, transforms: Per node name, mesh index, (4, 4).
+    """
+    blobs, accessors, meshes = _box_accessors(vertices, faces, mesh_colors)
+
+    # glTF matrices are column-major
+    nodes = [{'name': name, 'mesh': int(mesh), 'matrix': matrix.T.reshape(-1).tolist()}
+             for name, mesh, matrix in zip(node_names, node_meshes, transforms)]
+
+    gltf = {
+        'asset': {'version': '2.0'},
+        'scene': 0,
+        'scenes': [{'nodes': list(range(len(nodes)))}],
+        'nodes': nodes,
+        'meshes': meshes,
+        'accessors': accessors,
     }
-    return cmap.get(color_name.lower(), [128, 128, 128, 255]) # Default gray
+    _write_glb(glb_output_path, gltf, blobs)
+
+def write_dice_glb_instanced(glb_output_path, vertices, faces, mesh_colors, node_names, node_meshes,
+                             positions, quaternions, scales):
+    """
+    Writes a GLB with one EXT_mesh_gpu_instancing node per color mesh.
+
+    Each node carries TRANSLATION / ROTATION / SCALE accessors for all dice
+    of that color; the dice ids are kept in the node's extras.
 
-def process_dice_twin(json_input_path, glb_output_path):
+    positions, scales: (N, 3). quaternions: (N, 4) as (x, y, z, w).
+    """
+    blobs, accessors, meshes = _box_accessors(vertices, faces, mesh_colors)
+    node_meshes = np.asarray(node_meshes, dtype=np.intp).reshape(-1)
+    trs = (('TRANSLATION', 'VEC3', positions), ('ROTATION', 'VEC4', quaternions), ('SCALE', 'VEC3', scales))
+
+    nodes = []
+    for mesh in range(len(meshes)):
+        members = np.flatnonzero(node_meshes == mesh)
+        attributes = {}
+        for semantic, kind, values in trs:
+            data = np.ascontiguousarray(values[members], dtype=np.float32)
+            attributes[semantic] = len(accessors)
+            accessors.append({'bufferView': len(blobs), 'componentType': 5126,
+                              'count': len(members), 'type': kind})
+            blobs.append(data)
+        nodes.append({'name': f'dice_{mesh}', 'mesh': mesh,
+                      'extensions': {'EXT_mesh_gpu_instancing': {'attributes': attributes}},
+                      'extras': {'instances': [node_names[i] for i in members.tolist()]}})
+
+    gltf = {
+        'asset': {'version': '2.0'},
+        'extensionsUsed': ['EXT_mesh_gpu_instancing'],
+        'scene': 0,
+        'scenes': [{'nodes': list(range(len(nodes)))}],
+        'nodes': nodes,
+        'meshes': meshes,
+        'accessors': accessors,
+    }
+    _write_glb(glb_output_path, gltf, blobs)
+
+def process_dice_twin(json_input_path, glb_output_path, instanced=GPU_INSTANCING):
     # 1. Dynamic Loading: Read from external JSON file
     if not os.path.exists(json_input_path):
         raise FileNotFoundError(f"Input file not found: {json_input_path}")
         
-    with open(json_input_path, 'r') as f:
-        data = json.load(f)
-
-    # Initialize Scene
-    scene = trimesh.Scene()
-    
-    # 2. Iterate through objects
-    objects = data.get('objects', [])
-    print(f"Processing {len(objects)} objects...")
-
-    for obj in objects:
-        obj_id = obj.get('id', 'unknown')
-        props = obj.get('properties', {})
-        trans = obj.get('transform', {})
-        
-        # Geometry Creation
-        # We assume 'dice' is a cube. Let's give it a base size.
-        # Since positions are around ~80 units, a size of 4.0 ensures visibility.
-        mesh = trimesh.creation.box(extents=[4.0, 4.0, 4.0])
-        
-        # Apply Color
-        color_name = props.get('color', 'gray')
-        rgba = get_color_rgba(color_name)
-        mesh.visual.face_colors = rgba
-        
-        # -------------------------------------------------
-        # Transform Logic
-        # -------------------------------------------------
-        
-        # Position
-        pos_data = trans.get('position', {'x': 0, 'y': 0, 'z': 0})
-        translation = [pos_data['x'], pos_data['y'], pos_data['z']]
-        
-        # Rotation (Euler Degrees -> Radians -> Matrix)
-        rot_data = trans.get('rotation', {'x': 0, 'y': 0, 'z': 0})
-        # Converting degrees to radians
-        euler_angles = np.radians([rot_data['x'], rot_data['y'], rot_data['z']])
-        # Create rotation matrix (Assuming standard XYZ order)
-        matrix_rot = trimesh.transformations.euler_matrix(
-            euler_angles[0], euler_angles[1], euler_angles[2], axes='sxyz'
-        )
-        
-        # Scale
-        scale_data = trans.get('scale', {'x': 1, 'y': 1, 'z': 1})
-        matrix_scale = np.eye(4)
-        matrix_scale[0,0] = scale_data['x']
-        matrix_scale[1,1] = scale_data['y']
-        matrix_scale[2,2] = scale_data['z']
-        
-        # Translation Matrix
-        matrix_trans = trimesh.transformations.translation_matrix(translation)
-        
-        # Combine Matrices: Translation * Rotation * Scale
-        # Note: Trimesh handles multiplication order for us usually, 
-        # but logically it is T @ R @ S
-        final_transform = trimesh.transformations.concatenate_matrices(
-            matrix_trans, matrix_rot, matrix_scale
-        )
-        
-        # Apply transform to mesh
-        # mesh.apply_transform(final_transform) #메쉬의 점(Vertex) 자체를 이동시켜 담고 있는 그릇(Node)은 (0,0,0)에 위치
-        
-        # Add to scene
-        # scene.add_geometry(mesh, node_name=obj_id)
-        scene.add_geometry(mesh, node_name=obj_id, transform=final_transform) #메쉬 자체를 변형하지 말고, 메쉬를 담는 노드(Node)에 변환 정보를 주기
+    # Objects are parsed one at a time; only the fields used below are kept
+    # (flat rows: position xyz, rotation xyz in Euler degrees, scale xyz)
+    ids, colors, rows = [], [], []
+    for obj in iter_objects(json_input_path):
+        trans = obj.get('transform', _EMPTY)
+        pd = trans.get('position', _ZERO_XYZ)
+        rd = trans.get('rotation', _ZERO_XYZ)
+        sd = trans.get('scale', _ONE_XYZ)
+        ids.append(obj.get('id', 'unknown'))
+        colors.append(obj.get('properties', _EMPTY).get('color', 'gray'))
+        rows.append((pd['x'], pd['y'], pd['z'], rd['x'], rd['y'], rd['z'], sd['x'], sd['y'], sd['z']))
+
+    # 2. Build objects
+    print(f"Processing {len(ids)} objects...")
+
+    # Position, Rotation in Euler degrees, Scale for all objects at once
+    rows = np.asarray(rows, dtype=float).reshape(-1, 9)
+
+    # Geometry Creation
+    # We assume 'dice' is a cube. Let's give it a base size.
+    # Since positions are around ~80 units, a size of 4.0 ensures visibility.
+    # One box is shared by all dice: one mesh per color, and each dice is a
+    # node carrying its own transform (position/rotation/scale).
+    base_box = trimesh.creation.box(extents=[4.0, 4.0, 4.0])
+    color_index = {}
+    node_meshes = []
+
+    for color_name in colors:
+        # Resolve (or register) the shared mesh index of this color
+        color_name = color_name.lower()
+        mesh = color_index.get(color_name)
+        if mesh is None:
+            mesh = color_index[color_name] = len(color_index)
+        node_meshes.append(mesh)
 
     # 3. Export
     # Ensure directory exists
@@ -104,7 +282,15 @@ def process_dice_twin(json_input_path, glb_output_path):
             return
 
     print(f"Exporting GLB to: {glb_output_path}")
-    scene.export(glb_output_path)
+    mesh_colors = [get_color_rgba(color_name) for color_name in color_index]
+    if instanced:
+        write_dice_glb_instanced(glb_output_path, base_box.vertices, base_box.faces, mesh_colors,
+                                 ids, node_meshes, rows[:, 0:3],
+                                 euler_to_quaternions(rows[:, 3:6]), rows[:, 6:9])
+    else:
+        final_transforms = build_transforms(rows[:, 0:3], rows[:, 3:6], rows[:, 6:9])
+        write_dice_glb(glb_output_path, base_box.vertices, base_box.faces, mesh_colors,
+                       ids, node_meshes, final_transforms)
     print("Generation Complete.")
 
 if __name__ == "__main__":
@@ -5,10 +5,99 @@ All comparisons in one place.
 import sys
 sys.path.insert(0, ".")
 
-import json
 import math
 from itertools import product
-from geometry_engine import compute_geometry, compute_reach
+
+import numpy as np
+
+from config_cache import get_geometry
+from geometry_engine import compute_geometry_cached, compute_reach
+
+
+# Distance table: rows of the point array are
+# 0=share, 1=left base, 2=right base, 3..6=V1..V4
+DIST_KEYS = (
+    "share_to_base_left", "share_to_base_right",
+    "base_left_to_v1", "base_left_to_v2", "base_right_to_v3", "base_right_to_v4",
+    "share_to_v1", "share_to_v2", "share_to_v3", "share_to_v4",
+    "v1_v2", "v2_v3", "v3_v4", "v4_v1", "v1_v3", "v2_v4",
+)
+DIST_I = np.array([0, 0, 1, 1, 2, 2, 0, 0, 0, 0, 3, 4, 5, 6, 3, 4])
+DIST_J = np.array([1, 2, 3, 4, 5, 6, 3, 4, 5, 6, 4, 5, 6, 3, 5, 6])
+# Base-to-vertex entries come from the engine's reach, not the 2D distance
+REACH_SLOTS = slice(2, 6)
+# Vertex-to-vertex entries, as indices into a (4, 2) V1..V4 array
+VV_SLOTS = slice(10, 16)
+VV_I = DIST_I[VV_SLOTS] - 3
+VV_J = DIST_J[VV_SLOTS] - 3
+
+# Default measured values (mm), in DIST_KEYS order
+DEFAULT_MEASURED = {
+    # Base distances
+    "share_to_base_left": 256.5,
+    "share_to_base_right": 268.0,
+    # Base to Vertex (reach)
+    "base_left_to_v1": 250,
+    "base_left_to_v2": 185,
+    "base_right_to_v3": 198,
+    "base_right_to_v4": 225,
+    # Share to Vertex
+    "share_to_v1": 282,
+    "share_to_v2": 268,
+    "share_to_v3": 268,
+    "share_to_v4": 296,
+    # Vertex to Vertex
+    "v1_v2": 390,
+    "v2_v3": 380,
+    "v3_v4": 390,
+    "v4_v1": 284,
+    "v1_v3": 546,
+    "v2_v4": 546,
+}
+# DEFAULT_MEASURED values as a read-only array, in DIST_KEYS order
+MEASURED_ARR = np.array([DEFAULT_MEASURED[k] for k in DIST_KEYS], dtype=np.float64)
+MEASURED_ARR.flags.writeable = False
+
+# Share-Base-Vertex triangle sides per vertex (V1..V4), as DIST_KEYS slots
+TRI_NAMES = ("V1", "V2", "V3", "V4")
+TRI_SB = np.array([0, 0, 1, 1])
+TRI_BV = np.array([2, 3, 4, 5])
+TRI_SV = np.array([6, 7, 8, 9])
+
+# Bound once: skips the module attribute lookup per call
+_hypot = math.hypot
+
+# Radian to degree factor (a multiply is cheaper than math.degrees)
+_RAD2DEG = 180.0 / math.pi
+
+# Report separators
+_RULE = "=" * 90
+_LINE_90 = "-" * 90
+_LINE_70 = "-" * 70
+_LINE_60 = "-" * 60
+_LINE_55 = "-" * 55
+_LINE_40 = "-" * 40
+
+# Report table headers (constant text, formatted once at import)
+_HDR_COORDS = f"{'Point':<15} {'Engine':<25} {'Trilateration':<25}"
+_HDR_COMPARE = f"{'Item':<22} {'Measured':>10} {'Engine':>10} {'Eng Err':>10} {'Trilat':>10} {'Tri Err':>10}"
+_HDR_TRIANGLE = f"{'Triangle':<12} {'S->B':<12} {'B->V':<12} {'S->V':<12} {'Status':<10}"
+_HDR_TRILAT = f"{'Item':<22} {'Measured':>10} {'Trilat':>10} {'Error':>10}"
+_TOTAL_LABEL = f"{'TOTAL ERROR':<22} {'':<10} {'':<10} "
+
+
+def all_distances(points):
+    """
+    All 16 verification distances for one point set.
+
+    Args:
+        points: (7, 2) array of [share, left base, right base, V1..V4]
+
+    Returns:
+        (16,) array in DIST_KEYS order
+    """
+    diff = points[DIST_I] - points[DIST_J]
+    return np.hypot(diff[:, 0], diff[:, 1])
 
 
 def run_verification(config, measured=None, threshold=50):
@@ -29,32 +118,12 @@ def run_verification(config, measured=None, threshold=50):
             - is_valid: bool (total_error < threshold)
             - engine_calc: dict of calculated distances
     """
-    # Default measured values
-    if measured is None:
-        measured = {
-            "share_to_base_left": 256.5,
-            "share_to_base_right": 268.0,
-            "base_left_to_v1": 250,
-            "base_left_to_v2": 185,
-            "base_right_to_v3": 198,
-            "base_right_to_v4": 225,
-            "share_to_v1": 282,
-            "share_to_v2": 268,
-            "share_to_v3": 268,
-            "share_to_v4": 296,
-            "v1_v2": 390,
-            "v2_v3": 380,
-            "v3_v4": 390,
-            "v4_v1": 284,
-            "v1_v3": 546,
-            "v2_v4": 546,
-        }
-    
-    def dist(p1, p2):
-        return math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2)
+    use_default = measured is None
+    if use_default:
+        measured = DEFAULT_MEASURED
     
-    # Compute geometry from config
-    geometry = compute_geometry(config)
+    # Compute geometry from config (memoized for repeated configs)
+    geometry = compute_geometry_cached(config)
     bases = geometry.get("bases", {})
     vertices = geometry.get("vertices", {})
     
@@ -68,48 +137,37 @@ def run_verification(config, measured=None, threshold=50):
         v[vid] = (vdata.get("x", 0), vdata.get("y", 0))
         v_reach[vid] = vdata.get("reach", 0)
     
-    # Calculate distances
-    engine_calc = {
-        "share_to_base_left": dist((0, 0), lb),
-        "share_to_base_right": dist((0, 0), rb),
-        "base_left_to_v1": v_reach["1"],
-        "base_left_to_v2": v_reach["2"],
-        "base_right_to_v3": v_reach["3"],
-        "base_right_to_v4": v_reach["4"],
-        "share_to_v1": dist((0, 0), v["1"]),
-        "share_to_v2": dist((0, 0), v["2"]),
-        "share_to_v3": dist((0, 0), v["3"]),
-        "share_to_v4": dist((0, 0), v["4"]),
-        "v1_v2": dist(v["1"], v["2"]),
-        "v2_v3": dist(v["2"], v["3"]),
-        "v3_v4": dist(v["3"], v["4"]),
-        "v4_v1": dist(v["4"], v["1"]),
-        "v1_v3": dist(v["1"], v["3"]),
-        "v2_v4": dist(v["2"], v["4"]),
-    }
+    # Calculate distances (one vectorized pass over all pairs)
+    pts = np.array([(0, 0), lb, rb, v["1"], v["2"], v["3"], v["4"]], dtype=np.float64)
+    d = all_distances(pts)
+    d[REACH_SLOTS] = [v_reach["1"], v_reach["2"], v_reach["3"], v_reach["4"]]
+    engine_calc = dict(zip(DIST_KEYS, d.tolist()))
+    
+    # Calculate errors (defaults are already laid out in DIST_KEYS order)
+    if use_default:
+        keys, m_arr, e_arr = DIST_KEYS, MEASURED_ARR, d
+    else:
+        keys = tuple(measured)
+        m_arr = np.fromiter((measured[k] for k in keys), dtype=np.float64, count=len(keys))
+        e_arr = np.fromiter((engine_calc[k] for k in keys), dtype=np.float64, count=len(keys))
+    err = np.abs(e_arr - m_arr)
+    err_list = err.tolist()
+    total_error = float(err.sum())
+    
+    items = [{"name": k, "error": e, "measured": measured[k], "calculated": engine_calc[k]}
+             for k, e in zip(keys, err_list)]
+    bad_mask = (err >= 10).tolist()
+    bad_items = [item for item, bad in zip(items, bad_mask) if bad]
+    ok_items = [item for item, bad in zip(items, bad_mask) if not bad]
     
-    # Calculate errors
-    bad_items = []
-    ok_items = []
-    total_error = 0
+    # First maximum wins, matching the old strict '>' scan; all-zero -> no name
     largest_error_name = ""
     largest_error_val = 0
-    
-    for key in measured:
-        m = measured[key]
-        e = engine_calc[key]
-        err = abs(e - m)
-        total_error += err
-        
-        item = {"name": key, "error": err, "measured": m, "calculated": e}
-        if err >= 10:
-            bad_items.append(item)
-        else:
-            ok_items.append(item)
-        
-        if err > largest_error_val:
-            largest_error_val = err
-            largest_error_name = key
+    if keys:
+        idx = int(err.argmax())
+        if err_list[idx] > 0:
+            largest_error_name = keys[idx]
+            largest_error_val = err_list[idx]
     
     return {
         "total_error": total_error,
@@ -121,16 +179,14 @@ def run_verification(config, measured=None, threshold=50):
     }
 
 
-
-
 def dist(p1, p2):
-    return math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2)
+    return _hypot(p1[0] - p2[0], p1[1] - p2[1])
 
 
 def circle_intersection(c1, r1, c2, r2):
     x1, y1 = c1
     x2, y2 = c2
-    d = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+    d = _hypot(x2 - x1, y2 - y1)
     if d > r1 + r2 or d < abs(r1 - r2) or d == 0:
         return None
     a = (r1 ** 2 - r2 ** 2 + d ** 2) / (2 * d)
@@ -144,75 +200,77 @@ def circle_intersection(c1, r1, c2, r2):
             (px - h * (y2 - y1) / d, py + h * (x2 - x1) / d))
 
 
+def circle_intersection_batch(c1, r1, c2, r2):
+    """
+    Vectorized circle_intersection over N circle pairs.
+
+    Args:
+        c1, c2: (N, 2) centers (a single (2,) center broadcasts)
+        r1, r2: (N,) radii
+
+    Returns:
+        (p1, p2): two (N, 2) arrays in the same order as circle_intersection;
+        rows with no intersection are NaN instead of None
+    """
+    c1 = np.asarray(c1, dtype=np.float64)
+    c2 = np.asarray(c2, dtype=np.float64)
+    r1 = np.asarray(r1, dtype=np.float64)
+    r2 = np.asarray(r2, dtype=np.float64)
+
+    delta = c2 - c1
+    d2 = (delta * delta).sum(axis=-1)
+    d = np.sqrt(d2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = (r1 * r1 - r2 * r2 + d2) / (2 * d)
+        h_sq = r1 * r1 - a * a
+        h = np.sqrt(h_sq)
+        mid = c1 + a[..., None] * delta / d[..., None]
+        off = h[..., None] * np.stack((delta[..., 1], -delta[..., 0]), axis=-1) / d[..., None]
+
+    fail = (d > r1 + r2) | (d < np.abs(r1 - r2)) | (d == 0) | ~(h_sq >= 0)
+    fail = fail[..., None]
+    return np.where(fail, np.nan, mid + off), np.where(fail, np.nan, mid - off)
+
+
 # ============================================================
 # SCRIPT MODE: Run when executed directly
 # ============================================================
 if __name__ == "__main__":
-    with open("servo_config.json", "r") as f:
-        config = json.load(f)
+    config, geometry = get_geometry()
 
     # ============================================================
     # ALL MEASURED VALUES (from user)
     # ============================================================
-    MEASURED = {
-        # Base distances
-        "share_to_base_left": 256.5,
-        "share_to_base_right": 268.0,
-        # Base to Vertex (reach)
-        "base_left_to_v1": 250,
-        "base_left_to_v2": 185,
-        "base_right_to_v3": 198,
-        "base_right_to_v4": 225,
-        # Share to Vertex
-        "share_to_v1": 282,
-        "share_to_v2": 268,
-        "share_to_v3": 268,
-        "share_to_v4": 296,
-        # Vertex to Vertex
-        "v1_v2": 390,
-        "v2_v3": 380,
-        "v3_v4": 390,
-        "v4_v1": 284,
-        "v1_v3": 546,
-        "v2_v4": 546,
-    }
+    MEASURED = DEFAULT_MEASURED
 
     # ============================================================
     # METHOD 1: GEOMETRY ENGINE (current implementation)
     # ============================================================
-    geometry = compute_geometry(config)
     bases_engine = geometry.get("bases", {})
     vertices_engine = geometry.get("vertices", {})
+    vids = ["1", "2", "3", "4"]
+    measured_arr = np.fromiter((MEASURED[k] for k in DIST_KEYS), dtype=np.float64, count=len(DIST_KEYS))
+
+    # Points as one (7, 2) array: share, left base, right base, V1..V4
+    engine_pts = np.zeros((7, 2))
+    engine_pts[1] = bases_engine["left_arm"]["x"], bases_engine["left_arm"]["y"]
+    engine_pts[2] = bases_engine["right_arm"]["x"], bases_engine["right_arm"]["y"]
+    reach_engine = np.empty(4)
+    for i, vid in enumerate(vids):
+        v = vertices_engine.get(vid, {})
+        engine_pts[3 + i] = v.get("x", 0), v.get("y", 0)
+        reach_engine[i] = v.get("reach", 0)
 
-    lb_engine = (bases_engine["left_arm"]["x"], bases_engine["left_arm"]["y"])
-    rb_engine = (bases_engine["right_arm"]["x"], bases_engine["right_arm"]["y"])
+    # Tuple views, for the coordinate printout and trilateration inputs
+    lb_engine = tuple(engine_pts[1].tolist())
+    rb_engine = tuple(engine_pts[2].tolist())
+    v_engine = {vid: tuple(engine_pts[3 + i].tolist()) for i, vid in enumerate(vids)}
 
-    v_engine = {}
-    v_reach_engine = {}
-    for vid in ["1", "2", "3", "4"]:
-        v = vertices_engine.get(vid, {})
-        v_engine[vid] = (v.get("x", 0), v.get("y", 0))
-        v_reach_engine[vid] = v.get("reach", 0)
-
-    # Engine calculated distances
-    engine_calc = {
-        "share_to_base_left": dist((0, 0), lb_engine),
-        "share_to_base_right": dist((0, 0), rb_engine),
-        "base_left_to_v1": v_reach_engine["1"],
-        "base_left_to_v2": v_reach_engine["2"],
-        "base_right_to_v3": v_reach_engine["3"],
-        "base_right_to_v4": v_reach_engine["4"],
-        "share_to_v1": dist((0, 0), v_engine["1"]),
-        "share_to_v2": dist((0, 0), v_engine["2"]),
-        "share_to_v3": dist((0, 0), v_engine["3"]),
-        "share_to_v4": dist((0, 0), v_engine["4"]),
-        "v1_v2": dist(v_engine["1"], v_engine["2"]),
-        "v2_v3": dist(v_engine["2"], v_engine["3"]),
-        "v3_v4": dist(v_engine["3"], v_engine["4"]),
-        "v4_v1": dist(v_engine["4"], v_engine["1"]),
-        "v1_v3": dist(v_engine["1"], v_engine["3"]),
-        "v2_v4": dist(v_engine["2"], v_engine["4"]),
-    }
+    # Engine calculated distances (base-to-vertex from the engine's reach)
+    engine_geo = all_distances(engine_pts)
+    engine_arr = engine_geo.copy()
+    engine_arr[REACH_SLOTS] = reach_engine
+    engine_calc = dict(zip(DIST_KEYS, engine_arr.tolist()))
 
 
     # ============================================================
@@ -225,291 +283,234 @@ if __name__ == "__main__":
     lb_tri = lb_engine
     rb_tri = rb_engine
 
-    # Get vertex candidates using MEASURED distances
-    candidates = {}
-    for vid in ["1", "2", "3", "4"]:
-        base = lb_tri if v_owners[vid] == "left" else rb_tri
-        r1 = MEASURED[f"share_to_v{vid}"]
-        r2 = MEASURED[f"base_{'left' if v_owners[vid] == 'left' else 'right'}_to_v{vid}"]
-        pts = circle_intersection(share, r1, base, r2)
-        if pts:
-            candidates[vid] = pts
-
-    # Find best combination
-    best_err = float("inf")
-    best_v_tri = None
-
-    for combo in product([0, 1], repeat=4):
-        if any(vid not in candidates for vid in ["1", "2", "3", "4"]):
-            break
-        v = {vid: candidates[vid][combo[i]] for i, vid in enumerate(["1", "2", "3", "4"])}
-        calc = {
-            "v1_v2": dist(v["1"], v["2"]), "v2_v3": dist(v["2"], v["3"]),
-            "v3_v4": dist(v["3"], v["4"]), "v4_v1": dist(v["4"], v["1"]),
-            "v1_v3": dist(v["1"], v["3"]), "v2_v4": dist(v["2"], v["4"]),
-        }
-        err = sum(abs(calc[k] - MEASURED[k]) for k in ["v1_v2", "v2_v3", "v3_v4", "v4_v1", "v1_v3", "v2_v4"])
-        if err < best_err:
-            best_err = err
-            best_v_tri = v
+    # Get vertex candidates using MEASURED distances (all four in one batch)
+    sides = [v_owners[vid] for vid in vids]
+    tri_bases = np.array([lb_tri if side == "left" else rb_tri for side in sides])
+    r_share = np.array([MEASURED[f"share_to_v{vid}"] for vid in vids], dtype=np.float64)
+    r_base = np.array([MEASURED[f"base_{side}_to_v{vid}"] for vid, side in zip(vids, sides)],
+                      dtype=np.float64)
+    p1, p2 = circle_intersection_batch(share, r_share, tri_bases, r_base)
+    found = ~np.isnan(p1[:, 0])
+    candidates = {
+        vid: (tuple(p1[i].tolist()), tuple(p2[i].tolist()))
+        for i, vid in enumerate(vids) if found[i]
+    }
+
+    # Vertices without an intersection fall back to the engine position
+    # (both picks equal), so the search below always has a full set
+    missing = [vid for vid in vids if vid not in candidates]
+    if missing:
+        print(f"[WARN] No trilateration candidates for V{', V'.join(missing)}; using engine positions")
+        for vid in missing:
+            candidates[vid] = (v_engine[vid], v_engine[vid])
+
+    # Find best combination: score all 16 candidate picks at once
+    combos = np.array(list(product([0, 1], repeat=4)))          # (16, 4)
+    cand = np.array([candidates[vid] for vid in vids])           # (4, 2, 2)
+    picks = cand[np.arange(4), combos]                           # (16, 4, 2)
+    diff = picks[:, VV_I] - picks[:, VV_J]
+    calc = np.hypot(diff[..., 0], diff[..., 1])                  # (16, 6)
+    measured_vv = np.array([MEASURED[k] for k in DIST_KEYS[VV_SLOTS]], dtype=np.float64)
+    err = np.abs(calc - measured_vv).sum(axis=1)
+    best = int(err.argmin())  # First minimum, as the old strict '<' scan
+    best_v_tri = {vid: tuple(picks[best, i].tolist()) for i, vid in enumerate(vids)}
 
     # Trilateration calculated distances
-    tri_calc = {
-        "share_to_base_left": dist(share, lb_tri),
-        "share_to_base_right": dist(share, rb_tri),
-        "base_left_to_v1": dist(lb_tri, best_v_tri["1"]),
-        "base_left_to_v2": dist(lb_tri, best_v_tri["2"]),
-        "base_right_to_v3": dist(rb_tri, best_v_tri["3"]),
-        "base_right_to_v4": dist(rb_tri, best_v_tri["4"]),
-        "share_to_v1": dist(share, best_v_tri["1"]),
-        "share_to_v2": dist(share, best_v_tri["2"]),
-        "share_to_v3": dist(share, best_v_tri["3"]),
-        "share_to_v4": dist(share, best_v_tri["4"]),
-        "v1_v2": dist(best_v_tri["1"], best_v_tri["2"]),
-        "v2_v3": dist(best_v_tri["2"], best_v_tri["3"]),
-        "v3_v4": dist(best_v_tri["3"], best_v_tri["4"]),
-        "v4_v1": dist(best_v_tri["4"], best_v_tri["1"]),
-        "v1_v3": dist(best_v_tri["1"], best_v_tri["3"]),
-        "v2_v4": dist(best_v_tri["2"], best_v_tri["4"]),
-    }
+    tri_pts = np.array([share, lb_tri, rb_tri] + [best_v_tri[vid] for vid in vids], dtype=np.float64)
+    tri_arr = all_distances(tri_pts)
+    tri_calc = dict(zip(DIST_KEYS, tri_arr.tolist()))
 
 
     # ============================================================
     # OUTPUT: COMPREHENSIVE COMPARISON
     # ============================================================
-    print("=" * 90)
-    print("COMPREHENSIVE COMPARISON: MEASURED vs ENGINE vs TRILATERATION")
-    print("=" * 90)
-    print()
+    out = []  # Report lines, written to stdout in one go at the end
+    out.append(_RULE)
+    out.append("COMPREHENSIVE COMPARISON: MEASURED vs ENGINE vs TRILATERATION")
+    out.append(_RULE)
+    out.append("")
 
     # Coordinates
-    print("COORDINATES:")
-    print("-" * 60)
-    print(f"{'Point':<15} {'Engine':<25} {'Trilateration':<25}")
-    print("-" * 60)
-    print(f"{'Left Base':<15} ({lb_engine[0]:>7.1f}, {lb_engine[1]:>7.1f})       ({lb_tri[0]:>7.1f}, {lb_tri[1]:>7.1f})")
-    print(f"{'Right Base':<15} ({rb_engine[0]:>7.1f}, {rb_engine[1]:>7.1f})       ({rb_tri[0]:>7.1f}, {rb_tri[1]:>7.1f})")
+    out.append("COORDINATES:")
+    out.append(_LINE_60)
+    out.append(_HDR_COORDS)
+    out.append(_LINE_60)
+    out.append(f"{'Left Base':<15} ({lb_engine[0]:>7.1f}, {lb_engine[1]:>7.1f})       ({lb_tri[0]:>7.1f}, {lb_tri[1]:>7.1f})")
+    out.append(f"{'Right Base':<15} ({rb_engine[0]:>7.1f}, {rb_engine[1]:>7.1f})       ({rb_tri[0]:>7.1f}, {rb_tri[1]:>7.1f})")
     for vid in ["1", "2", "3", "4"]:
         e = v_engine[vid]
         t = best_v_tri[vid]
-        print(f"{'V' + vid:<15} ({e[0]:>7.1f}, {e[1]:>7.1f})       ({t[0]:>7.1f}, {t[1]:>7.1f})")
-    print()
+        out.append(f"{'V' + vid:<15} ({e[0]:>7.1f}, {e[1]:>7.1f})       ({t[0]:>7.1f}, {t[1]:>7.1f})")
+    out.append("")
 
     # Distances
-    print("DISTANCES COMPARISON:")
-    print("-" * 90)
-    header = f"{'Item':<22} {'Measured':>10} {'Engine':>10} {'Eng Err':>10} {'Trilat':>10} {'Tri Err':>10}"
-    print(header)
-    print("-" * 90)
+    out.append("DISTANCES COMPARISON:")
+    out.append(_LINE_90)
+    out.append(_HDR_COMPARE)
+    out.append(_LINE_90)
 
+    # Slices into DIST_KEYS order
     categories = [
-        ("=== Share to Base ===", ["share_to_base_left", "share_to_base_right"]),
-        ("=== Base to Vertex ===", ["base_left_to_v1", "base_left_to_v2", "base_right_to_v3", "base_right_to_v4"]),
-        ("=== Share to Vertex ===", ["share_to_v1", "share_to_v2", "share_to_v3", "share_to_v4"]),
-        ("=== Vertex to Vertex ===", ["v1_v2", "v2_v3", "v3_v4", "v4_v1", "v1_v3", "v2_v4"]),
+        ("=== Share to Base ===", slice(0, 2)),
+        ("=== Base to Vertex ===", slice(2, 6)),
+        ("=== Share to Vertex ===", slice(6, 10)),
+        ("=== Vertex to Vertex ===", slice(10, 16)),
     ]
 
-    total_eng_err = 0
-    total_tri_err = 0
-
-    for cat_name, keys in categories:
-        print(cat_name)
-        for key in keys:
-            m = MEASURED[key]
-            e = engine_calc[key]
-            t = tri_calc[key]
-            e_err = e - m
-            t_err = t - m
-            e_status = "[OK]" if abs(e_err) < 10 else "[BAD]"
-            t_status = "[OK]" if abs(t_err) < 10 else "[BAD]"
-            total_eng_err += abs(e_err)
-            total_tri_err += abs(t_err)
-            print(f"  {key:<20} {m:>10.1f} {e:>10.1f} {e_err:>+9.1f} {t:>10.1f} {t_err:>+9.1f}  {e_status} {t_status}")
-
-    print("-" * 90)
-    print(f"{'TOTAL ERROR':<22} {'':<10} {'':<10} {total_eng_err:>10.1f} {'':<10} {total_tri_err:>10.1f}")
-    print()
-    print(f"Engine total error:       {total_eng_err:.1f}mm")
-    print(f"Trilateration total error: {total_tri_err:.1f}mm")
-    print()
+    # Signed errors, totals and OK masks for all 16 items at once
+    err_eng = engine_arr - measured_arr
+    err_tri = tri_arr - measured_arr
+    abs_eng = np.abs(err_eng)
+    abs_tri = np.abs(err_tri)
+    total_eng_err = float(abs_eng.sum())
+    total_tri_err = float(abs_tri.sum())
+    rows_fmt = list(zip(DIST_KEYS, measured_arr.tolist(), engine_arr.tolist(), err_eng.tolist(),
+                        tri_arr.tolist(), err_tri.tolist(),
+                        (abs_eng < 10).tolist(), (abs_tri < 10).tolist()))
+
+    for cat_name, rows in categories:
+        out.append(cat_name)
+        for key, m, e, e_err, t, t_err, e_ok, t_ok in rows_fmt[rows]:
+            e_status = "[OK]" if e_ok else "[BAD]"
+            t_status = "[OK]" if t_ok else "[BAD]"
+            out.append(f"  {key:<20} {m:>10.1f} {e:>10.1f} {e_err:>+9.1f} {t:>10.1f} {t_err:>+9.1f}  {e_status} {t_status}")
+
+    out.append(_LINE_90)
+    out.append(f"{_TOTAL_LABEL}{total_eng_err:>10.1f} {'':<10} {total_tri_err:>10.1f}")
+    out.append("")
+    out.append(f"Engine total error:       {total_eng_err:.1f}mm")
+    out.append(f"Trilateration total error: {total_tri_err:.1f}mm")
+    out.append("")
     if total_tri_err < total_eng_err:
-        print(">> TRILATERATION IS BETTER")
+        out.append(">> TRILATERATION IS BETTER")
     else:
-        print(">> ENGINE IS BETTER")
+        out.append(">> ENGINE IS BETTER")
 
 
     # ============================================================
     # TRIANGLE VERIFICATION (역검산)
     # Verify that coordinates form valid triangles with measured distances
     # ============================================================
-    print()
-    print("=" * 90)
-    print("TRIANGLE VERIFICATION (Share-Base-Vertex)")
-    print("=" * 90)
-    print()
-    print("For each vertex, check if the triangle (Share, Base, Vertex) has consistent side lengths.")
-    print()
-
-    triangles = [
-        ("V1", "left", lb_engine, v_engine["1"], "1"),
-        ("V2", "left", lb_engine, v_engine["2"], "2"),
-        ("V3", "right", rb_engine, v_engine["3"], "3"),
-        ("V4", "right", rb_engine, v_engine["4"], "4"),
-    ]
-
-    print(f"{'Triangle':<12} {'S->B':<12} {'B->V':<12} {'S->V':<12} {'Status':<10}")
-    print("-" * 60)
-
-    for name, arm, base, vertex, vid in triangles:
-        # From coordinates
-        s_to_b = dist((0, 0), base)
-        b_to_v = dist(base, vertex)
-        s_to_v = dist((0, 0), vertex)
-    
-        # From measured
-        m_s_to_b = MEASURED[f"share_to_base_{arm}"]
-        m_b_to_v = MEASURED[f"base_{arm}_to_v{vid}"]
-        m_s_to_v = MEASURED[f"share_to_v{vid}"]
-    
-        # Check triangle inequality and side consistency
-        # Using law of cosines: c^2 = a^2 + b^2 - 2ab*cos(C)
-        # If consistent, all sides should match measured values
-        err_sb = abs(s_to_b - m_s_to_b)
-        err_bv = abs(b_to_v - m_b_to_v)
-        err_sv = abs(s_to_v - m_s_to_v)
-        total_tri_err_check = err_sb + err_bv + err_sv
-    
-        status = "[OK]" if total_tri_err_check < 15 else "[BAD]"
-    
-        print(f"{name:<12} {s_to_b:>5.1f}({err_sb:+.1f})  {b_to_v:>5.1f}({err_bv:+.1f})  {s_to_v:>5.1f}({err_sv:+.1f})  {status}")
-
-    print()
-    print("Legend: Calculated(Error vs Measured)")
-    print()
+    out.append("")
+    out.append(_RULE)
+    out.append("TRIANGLE VERIFICATION (Share-Base-Vertex)")
+    out.append(_RULE)
+    out.append("")
+    out.append("For each vertex, check if the triangle (Share, Base, Vertex) has consistent side lengths.")
+    out.append("")
+
+    # Sides from coordinates and from measurements
+    s_to_b, b_to_v, s_to_v = engine_geo[TRI_SB], engine_geo[TRI_BV], engine_geo[TRI_SV]
+    m_s_to_b, m_b_to_v, m_s_to_v = measured_arr[TRI_SB], measured_arr[TRI_BV], measured_arr[TRI_SV]
+
+    # Check triangle inequality and side consistency
+    # Using law of cosines: c^2 = a^2 + b^2 - 2ab*cos(C)
+    # If consistent, all sides should match measured values
+    err_sb = np.abs(s_to_b - m_s_to_b)
+    err_bv = np.abs(b_to_v - m_b_to_v)
+    err_sv = np.abs(s_to_v - m_s_to_v)
+    tri_ok = (err_sb + err_bv + err_sv < 15).tolist()
+
+    out.append(_HDR_TRIANGLE)
+    out.append(_LINE_60)
+
+    for name, sb, e_sb, bv, e_bv, sv, e_sv, ok in zip(
+            TRI_NAMES, s_to_b.tolist(), err_sb.tolist(), b_to_v.tolist(), err_bv.tolist(),
+            s_to_v.tolist(), err_sv.tolist(), tri_ok):
+        status = "[OK]" if ok else "[BAD]"
+        out.append(f"{name:<12} {sb:>5.1f}({e_sb:+.1f})  {bv:>5.1f}({e_bv:+.1f})  {sv:>5.1f}({e_sv:+.1f})  {status}")
+
+    out.append("")
+    out.append("Legend: Calculated(Error vs Measured)")
+    out.append("")
 
     # Detailed triangle angle verification
-    print("=" * 90)
-    print("TRIANGLE ANGLE VERIFICATION (Law of Cosines)")
-    print("=" * 90)
-    print()
-
-    for name, arm, base, vertex, vid in triangles:
-        s_to_b = dist((0, 0), base)
-        b_to_v = dist(base, vertex)
-        s_to_v = dist((0, 0), vertex)
-    
-        # Law of cosines to find angle at Base: cos(B) = (a^2 + c^2 - b^2) / (2ac)
-        # where a = S->B, b = S->V, c = B->V
-        a, b, c = s_to_b, s_to_v, b_to_v
-    
-        # Check if triangle is valid
-        if a + c > b and a + b > c and b + c > a:
-            cos_B = (a**2 + c**2 - b**2) / (2 * a * c)
-            cos_B = max(-1, min(1, cos_B))  # Clamp for numerical stability
-            angle_B = math.degrees(math.acos(cos_B))
-        
-            # Measured values
-            m_a = MEASURED[f"share_to_base_{arm}"]
-            m_b = MEASURED[f"share_to_v{vid}"]
-            m_c = MEASURED[f"base_{arm}_to_v{vid}"]
-        
-            if m_a + m_c > m_b and m_a + m_b > m_c and m_b + m_c > m_a:
-                cos_B_m = (m_a**2 + m_c**2 - m_b**2) / (2 * m_a * m_c)
-                cos_B_m = max(-1, min(1, cos_B_m))
-                angle_B_m = math.degrees(math.acos(cos_B_m))
-                angle_diff = angle_B - angle_B_m
-                status = "[OK]" if abs(angle_diff) < 5 else "[BAD]"
-                print(f"{name}: Angle at Base = {angle_B:.1f} deg (measured: {angle_B_m:.1f} deg, diff: {angle_diff:+.1f}) {status}")
-            else:
-                print(f"{name}: Invalid measured triangle")
+    out.append(_RULE)
+    out.append("TRIANGLE ANGLE VERIFICATION (Law of Cosines)")
+    out.append(_RULE)
+    out.append("")
+
+    def base_cosines(a, b, c):
+        """cos(B) = (a^2 + c^2 - b^2) / (2ac) with a = S->B, b = S->V, c = B->V; NaN if invalid."""
+        a2, b2, c2 = a * a, b * b, c * c
+        # Valid triangle: longest side shorter than the other two
+        longest = np.maximum(np.maximum(a, b), c)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(longest < a + b + c - longest, (a2 + c2 - b2) / (2 * a * c), np.nan)
+
+    # Cosine of the angle at Base for every triangle (NaN = invalid triangle)
+    cos_calc = base_cosines(s_to_b, s_to_v, b_to_v)
+    cos_meas = base_cosines(m_s_to_b, m_s_to_v, m_b_to_v)
+
+    # All angles in one pass; clip for numerical stability
+    angles_calc = np.arccos(np.clip(cos_calc, -1.0, 1.0)) * _RAD2DEG
+    angles_meas = np.arccos(np.clip(cos_meas, -1.0, 1.0)) * _RAD2DEG
+
+    for i, name in enumerate(TRI_NAMES):
+        if np.isnan(cos_calc[i]):
+            out.append(f"{name}: Invalid calculated triangle")
+        elif np.isnan(cos_meas[i]):
+            out.append(f"{name}: Invalid measured triangle")
         else:
-            print(f"{name}: Invalid calculated triangle")
+            angle_B = angles_calc[i]
+            angle_B_m = angles_meas[i]
+            angle_diff = angle_B - angle_B_m
+            status = "[OK]" if abs(angle_diff) < 5 else "[BAD]"
+            out.append(f"{name}: Angle at Base = {angle_B:.1f} deg (measured: {angle_B_m:.1f} deg, diff: {angle_diff:+.1f}) {status}")
 
 
     # ============================================================
     # MEASURED DATA CONSISTENCY CHECK
     # Can all measured distances be satisfied simultaneously?
     # ============================================================
-    print()
-    print("=" * 90)
-    print("MEASURED DATA CONSISTENCY CHECK")
-    print("=" * 90)
-    print()
-    print("Testing if measured distances are mathematically consistent...")
-    print()
+    out.append("")
+    out.append(_RULE)
+    out.append("MEASURED DATA CONSISTENCY CHECK")
+    out.append(_RULE)
+    out.append("")
+    out.append("Testing if measured distances are mathematically consistent...")
+    out.append("")
 
     # Use brute force trilateration with all 16 combinations
     # to find the best possible fit
 
-    def calc_all_distances(lb, rb, v1, v2, v3, v4):
-        share = (0, 0)
-        return {
-            "share_to_base_left": dist(share, lb),
-            "share_to_base_right": dist(share, rb),
-            "base_left_to_v1": dist(lb, v1),
-            "base_left_to_v2": dist(lb, v2),
-            "base_right_to_v3": dist(rb, v3),
-            "base_right_to_v4": dist(rb, v4),
-            "share_to_v1": dist(share, v1),
-            "share_to_v2": dist(share, v2),
-            "share_to_v3": dist(share, v3),
-            "share_to_v4": dist(share, v4),
-            "v1_v2": dist(v1, v2),
-            "v2_v3": dist(v2, v3),
-            "v3_v4": dist(v3, v4),
-            "v4_v1": dist(v4, v1),
-            "v1_v3": dist(v1, v3),
-            "v2_v4": dist(v2, v4),
-        }
-
-    def calc_total_error(distances):
-        return sum(abs(distances[k] - MEASURED[k]) for k in MEASURED)
-
     # Best result from trilateration (already computed)
-    print("Using trilateration-optimized positions:")
-    print("-" * 60)
-    print(f"  Left Base:  ({lb_tri[0]:.1f}, {lb_tri[1]:.1f})")
-    print(f"  Right Base: ({rb_tri[0]:.1f}, {rb_tri[1]:.1f})")
-    print(f"  V1:         ({best_v_tri['1'][0]:.1f}, {best_v_tri['1'][1]:.1f})")
-    print(f"  V2:         ({best_v_tri['2'][0]:.1f}, {best_v_tri['2'][1]:.1f})")
-    print(f"  V3:         ({best_v_tri['3'][0]:.1f}, {best_v_tri['3'][1]:.1f})")
-    print(f"  V4:         ({best_v_tri['4'][0]:.1f}, {best_v_tri['4'][1]:.1f})")
-    print()
-
-    # Calculate distances for trilateration result
-    tri_distances = calc_all_distances(
-        lb_tri, rb_tri,
-        best_v_tri["1"], best_v_tri["2"], best_v_tri["3"], best_v_tri["4"]
-    )
-
-    print("TRILATERATION DISTANCES vs MEASURED:")
-    print("-" * 70)
-    print(f"{'Item':<22} {'Measured':>10} {'Trilat':>10} {'Error':>10}")
-    print("-" * 55)
-
-    for key in MEASURED:
-        m = MEASURED[key]
-        t = tri_distances[key]
-        err = t - m
-        status = "[OK]" if abs(err) < 5 else "[BAD]"
-        print(f"  {key:<20} {m:>10.1f} {t:>10.1f} {err:>+9.1f} {status}")
-
-    print("-" * 55)
-    print(f"Total trilateration error: {calc_total_error(tri_distances):.1f}mm")
-    print()
-
-    # Check which measurements have the most error
-    errors = [(k, abs(tri_distances[k] - MEASURED[k])) for k in MEASURED]
-    errors.sort(key=lambda x: x[1], reverse=True)
-
-    print("LARGEST MEASUREMENT DISCREPANCIES:")
-    print("-" * 40)
-    for k, e in errors[:5]:
-        print(f"  {k}: {e:.1f}mm error")
-    print()
-
-    if calc_total_error(tri_distances) < 50:
-        print(">> MEASURED DATA IS ROUGHLY CONSISTENT")
+    out.append("Using trilateration-optimized positions:")
+    out.append(_LINE_60)
+    out.append(f"  Left Base:  ({lb_tri[0]:.1f}, {lb_tri[1]:.1f})")
+    out.append(f"  Right Base: ({rb_tri[0]:.1f}, {rb_tri[1]:.1f})")
+    out.append(f"  V1:         ({best_v_tri['1'][0]:.1f}, {best_v_tri['1'][1]:.1f})")
+    out.append(f"  V2:         ({best_v_tri['2'][0]:.1f}, {best_v_tri['2'][1]:.1f})")
+    out.append(f"  V3:         ({best_v_tri['3'][0]:.1f}, {best_v_tri['3'][1]:.1f})")
+    out.append(f"  V4:         ({best_v_tri['4'][0]:.1f}, {best_v_tri['4'][1]:.1f})")
+    out.append("")
+
+    out.append("TRILATERATION DISTANCES vs MEASURED:")
+    out.append(_LINE_70)
+    out.append(_HDR_TRILAT)
+    out.append(_LINE_55)
+
+    for (key, m, _, _, t, err, _, _), ok in zip(rows_fmt, (abs_tri < 5).tolist()):
+        status = "[OK]" if ok else "[BAD]"
+        out.append(f"  {key:<20} {m:>10.1f} {t:>10.1f} {err:>+9.1f} {status}")
+
+    out.append(_LINE_55)
+    out.append(f"Total trilateration error: {total_tri_err:.1f}mm")
+    out.append("")
+
+    # Check which measurements have the most error (stable: ties keep key order)
+    worst = np.argsort(-abs_tri, kind="stable")[:5]
+
+    out.append("LARGEST MEASUREMENT DISCREPANCIES:")
+    out.append(_LINE_40)
+    for k, e in zip([DIST_KEYS[i] for i in worst.tolist()], abs_tri[worst].tolist()):
+        out.append(f"  {k}: {e:.1f}mm error")
+    out.append("")
+
+    if total_tri_err < 50:
+        out.append(">> MEASURED DATA IS ROUGHLY CONSISTENT")
     else:
-        print(">> MEASURED DATA HAS SIGNIFICANT INCONSISTENCIES")
-        print("   Some vertex measurements may be incorrect")
+        out.append(">> MEASURED DATA HAS SIGNIFICANT INCONSISTENCIES")
+        out.append("   Some vertex measurements may be incorrect")
+
+    sys.stdout.write("\n".join(out) + "\n")